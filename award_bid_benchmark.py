@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark award_bid latency against the number of bids on a job.
+
+Seeds a scratch MongoDB database (MONGO_URL from backend/.env) with a job and
+N submitted bids, then times the award endpoint handler. Compares the bulk
+update_many/insert_many award with the previous per-bid update and insert loop.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+BID_COUNTS = [1, 10, 50, 100, 250]
+ROUNDS = 5
+
+
+async def per_bid_award(job, bid_id):
+    """The old award path - one update and one notification insert per rejected bid"""
+    db = server.db
+    await db.bids.update_one({"id": bid_id}, {"$set": {"status": "awarded"}})
+    await db.jobs.update_one({"id": job["id"]}, {"$set": {"status": "awarded"}})
+    other_bids = await db.bids.find({"job_id": job["id"], "id": {"$ne": bid_id}}).to_list(None)
+    for other_bid in other_bids:
+        await db.bids.update_one({"id": other_bid["id"]}, {"$set": {"status": "rejected"}})
+        await db.notifications.insert_one(server.Notification(
+            user_id=other_bid["supplier_id"],
+            title="Bid Update",
+            message=f"Your bid for '{job['title']}' was not selected this time. Keep bidding on other projects!",
+            type="bid_rejected",
+            related_job_id=job["id"],
+            related_bid_id=other_bid["id"]
+        ).dict())
+
+
+async def seed(db, buyer, count):
+    await db.jobs.delete_many({})
+    await db.bids.delete_many({})
+    await db.notifications.delete_many({})
+    job = {"id": str(uuid.uuid4()), "title": "Benchmark job", "category": "material", "description": "Benchmark",
+           "location": "Pune", "delivery_timeline": "1 week", "posted_by": buyer["id"], "status": "open",
+           "created_at": datetime.utcnow(), "file_urls": []}
+    await db.jobs.insert_one(dict(job))
+    bids = [{"id": str(uuid.uuid4()), "job_id": job["id"], "supplier_id": str(uuid.uuid4()), "price_quote": 1000.0 + i,
+             "delivery_estimate": "1 week", "status": "submitted", "created_at": datetime.utcnow()} for i in range(count)]
+    await db.bids.insert_many(bids)
+    return job, bids[0]["id"]
+
+
+async def timed(db, buyer, count, award):
+    samples = []
+    for _ in range(ROUNDS):
+        job, bid_id = await seed(db, buyer, count)
+        started = time.perf_counter()
+        await award(job, bid_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def main():
+    bench_db = f"{os.environ['DB_NAME']}_bench_{uuid.uuid4().hex[:8]}"
+    server.db = server.client[bench_db]
+    db = server.db
+
+    buyer = {"id": str(uuid.uuid4()), "email": "bench-buyer@example.com", "company_name": "Bench Buyer",
+             "contact_phone": "9999999999", "role": "buyer", "gst_number": "27ABCDE1234F1Z5",
+             "address": "Benchmark Street, Pune, Maharashtra - 411001", "created_at": datetime.utcnow()}
+    await db.users.insert_one(dict(buyer))
+    await db.bids.create_index("id")
+    await db.bids.create_index([("job_id", 1), ("status", 1)])
+    current_user = server.User(**buyer)
+    transactions = "on" if await server.supports_transactions() else "off (standalone server)"
+    print(f"Transactions: {transactions}")
+
+    print(f"{'bids':>6} {'per-bid (ms)':>14} {'bulk (ms)':>11} {'speedup':>9}")
+    try:
+        for count in BID_COUNTS:
+            old_ms = await timed(db, buyer, count, per_bid_award)
+            new_ms = await timed(db, buyer, count, lambda job, bid_id: server.award_bid(job["id"], bid_id, current_user))
+            print(f"{count:>6} {old_ms:>14.1f} {new_ms:>11.1f} {old_ms / new_ms:>8.1f}x")
+    finally:
+        await server.client.drop_database(bench_db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
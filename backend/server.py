@@ -1,20 +1,44 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request, Response, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.routing import Match
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne, ReplaceOne, DeleteOne, ReturnDocument, CursorType, monitoring
+from pymongo.errors import DuplicateKeyError, CollectionInvalid
+from bson import ObjectId
 from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional, Dict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
 from dotenv import load_dotenv
 import os
 import uuid
+import asyncio
+import time
+import threading
+import functools
+import contextvars
 import jwt
 import razorpay
 import json
+import orjson
+import re
+import base64
 import logging
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import secrets
+import hmac
+import hashlib
+import requests
+import queue
+import numpy as np
+import aiofiles
+import aiofiles.os
+import shutil
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -22,9 +46,101 @@ from email.mime.multipart import MIMEMultipart
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_CALL_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+class MetricsRegistry:
+    """Process-local counters, gauges and histograms rendered in the Prometheus text format.
+    
+    Updates come from the event loop and from the threads Motor runs commands on, so they take a lock.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.families: Dict[str, Dict] = {}
+    
+    def define(self, name: str, kind: str, help_text: str, buckets: Optional[tuple] = None):
+        self.families[name] = {"kind": kind, "help": help_text, "buckets": buckets, "samples": {}}
+    
+    def inc(self, name: str, labels: Dict[str, str], amount: float = 1.0):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            samples = self.families[name]["samples"]
+            samples[key] = samples.get(key, 0.0) + amount
+    
+    def observe(self, name: str, labels: Dict[str, str], value: float):
+        family = self.families[name]
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            sample = family["samples"].get(key)
+            if sample is None:
+                sample = family["samples"][key] = {"buckets": [0] * len(family["buckets"]), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(family["buckets"]):
+                if value <= bound:
+                    sample["buckets"][index] += 1
+            sample["sum"] += value
+            sample["count"] += 1
+    
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ""
+        escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+    
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            for name, family in self.families.items():
+                lines.append(f"# HELP {name} {family['help']}")
+                lines.append(f"# TYPE {name} {family['kind']}")
+                for key, sample in family["samples"].items():
+                    if family["kind"] != "histogram":
+                        lines.append(f"{name}{self._labels(key)} {sample}")
+                        continue
+                    for bound, count in zip(family["buckets"], sample["buckets"]):
+                        lines.append(f"{name}_bucket{self._labels(key + (('le', bound),))} {count}")
+                    lines.append(f"{name}_bucket{self._labels(key + (('le', '+Inf'),))} {sample['count']}")
+                    lines.append(f"{name}_sum{self._labels(key)} {sample['sum']}")
+                    lines.append(f"{name}_count{self._labels(key)} {sample['count']}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+metrics.define("http_requests_total", "counter", "HTTP requests by route and status")
+metrics.define("http_requests_in_flight", "gauge", "HTTP requests currently being handled")
+metrics.define("http_request_duration_seconds", "histogram", "HTTP request latency", LATENCY_BUCKETS)
+metrics.define("http_request_db_calls", "histogram", "MongoDB commands issued per HTTP request", DB_CALL_BUCKETS)
+metrics.define("http_request_db_seconds_total", "counter", "Time spent in MongoDB commands by route")
+metrics.define("mongodb_commands_total", "counter", "MongoDB commands by name and outcome")
+metrics.define("mongodb_command_duration_seconds", "histogram", "MongoDB command latency", LATENCY_BUCKETS)
+
+# Set per request by MetricsMiddleware; Motor copies the context into its executor threads
+request_db_stats: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar("request_db_stats", default=None)
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Counts and times every MongoDB command, globally and against the request that issued it"""
+    def started(self, event):
+        pass
+    
+    def succeeded(self, event):
+        self.record(event, "success")
+    
+    def failed(self, event):
+        self.record(event, "failure")
+    
+    def record(self, event, outcome: str):
+        seconds = event.duration_micros / 1_000_000
+        metrics.inc("mongodb_commands_total", {"command": event.command_name, "outcome": outcome})
+        metrics.observe("mongodb_command_duration_seconds", {"command": event.command_name}, seconds)
+        stats = request_db_stats.get()
+        if stats is not None:
+            with metrics.lock:
+                stats["calls"] += 1
+                stats["seconds"] += seconds
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[CommandMetricsListener()])
 db = client[os.environ['DB_NAME']]
 
 # Security
@@ -33,8 +149,95 @@ security = HTTPBearer()
 JWT_SECRET = os.environ['JWT_SECRET']
 JWT_ALGORITHM = "HS256"
 
-# Razorpay client
-razorpay_client = razorpay.Client(auth=(os.environ['RAZORPAY_KEY_ID'], os.environ['RAZORPAY_KEY_SECRET']))
+# Payment gateway
+class TimeoutSession(requests.Session):
+    """requests session that applies a default timeout to every call"""
+    def __init__(self, timeout: float, pool_size: int):
+        super().__init__()
+        self.timeout = timeout
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+    
+    def request(self, *args, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(*args, **kwargs)
+
+class RazorpayGateway:
+    """Async wrapper around the synchronous Razorpay SDK.
+    
+    Calls go through a pooled keep-alive session with a timeout and run on a
+    dedicated thread pool, so a slow Razorpay round trip never blocks the event loop.
+    """
+    def __init__(self, key_id: str, key_secret: str, pool_size: int, timeout: float):
+        self.client = razorpay.Client(session=TimeoutSession(timeout, pool_size), auth=(key_id, key_secret))
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="razorpay")
+    
+    async def create_order(self, amount: int, currency: str) -> Dict:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            self.client.order.create,
+            {"amount": amount, "currency": currency, "payment_capture": 1}
+        )
+    
+    async def verify_payment_signature(self, order_id: str, payment_id: str, signature: str):
+        # Signature check is a local HMAC - no network round trip
+        self.client.utility.verify_payment_signature({
+            'razorpay_order_id': order_id,
+            'razorpay_payment_id': payment_id,
+            'razorpay_signature': signature
+        })
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.client.session.close()
+
+class FakePaymentGateway:
+    """Local stand-in for Razorpay used for load testing the payment path offline.
+    
+    Orders are fabricated after a simulated network latency and signatures use
+    Razorpay's HMAC scheme, so sign() produces signatures that verify.
+    """
+    def __init__(self, key_secret: str, latency_seconds: float = 0.0):
+        self.key_secret = key_secret
+        self.latency_seconds = latency_seconds
+    
+    def sign(self, order_id: str, payment_id: str) -> str:
+        message = f"{order_id}|{payment_id}".encode()
+        return hmac.new(self.key_secret.encode(), message, hashlib.sha256).hexdigest()
+    
+    async def create_order(self, amount: int, currency: str) -> Dict:
+        await asyncio.sleep(self.latency_seconds)
+        return {
+            "id": f"order_{secrets.token_hex(7)}",
+            "entity": "order",
+            "amount": amount,
+            "amount_paid": 0,
+            "amount_due": amount,
+            "currency": currency,
+            "status": "created",
+            "created_at": int(time.time())
+        }
+    
+    async def verify_payment_signature(self, order_id: str, payment_id: str, signature: str):
+        if not hmac.compare_digest(self.sign(order_id, payment_id), signature):
+            raise razorpay.errors.SignatureVerificationError("Razorpay Signature Verification Failed")
+    
+    def close(self):
+        pass
+
+if os.environ.get('PAYMENT_GATEWAY', 'razorpay') == 'fake':
+    payment_gateway = FakePaymentGateway(
+        os.environ['RAZORPAY_KEY_SECRET'],
+        latency_seconds=float(os.environ.get('FAKE_PAYMENT_LATENCY_SECONDS', 0.2))
+    )
+else:
+    payment_gateway = RazorpayGateway(
+        os.environ['RAZORPAY_KEY_ID'],
+        os.environ['RAZORPAY_KEY_SECRET'],
+        pool_size=int(os.environ.get('RAZORPAY_POOL_SIZE', 10)),
+        timeout=float(os.environ.get('RAZORPAY_TIMEOUT_SECONDS', 10))
+    )
 SUBSCRIPTION_AMOUNT = int(os.environ['SUBSCRIPTION_AMOUNT'])  # ₹5000 per month in paise
 
 # Admin credentials
@@ -45,8 +248,216 @@ ADMIN_PASSWORD = os.environ['ADMIN_PASSWORD']
 SUPPORT_PHONE = os.environ['SUPPORT_PHONE']
 SUPPORT_EMAIL = os.environ['SUPPORT_EMAIL']
 
+# Email delivery
+class SMTPTransport:
+    """Pooled SMTP connections driven from worker threads, reused across batches.
+    
+    For local testing point it at a debugging server, e.g. `python -m aiosmtpd -n -l localhost:1025`
+    with SMTP_HOST=localhost, SMTP_PORT=1025 and SMTP_USE_TLS=false.
+    """
+    def __init__(self, host: str, port: int, username: Optional[str], password: Optional[str],
+                 use_tls: bool, pool_size: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle: "queue.Queue[smtplib.SMTP]" = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="smtp")
+    
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+    
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                connection.noop()
+                return connection
+            except smtplib.SMTPException:
+                # Server dropped the idle connection
+                pass
+    
+    def _send_batch(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        """One result per message - None once delivered, so a failure partway only fails the rest"""
+        errors: List[Optional[Exception]] = []
+        connection = None
+        try:
+            connection = self._checkout()
+            for message in messages:
+                try:
+                    connection.send_message(message)
+                    errors.append(None)
+                except smtplib.SMTPServerDisconnected as e:
+                    errors.append(e)
+                    connection = None
+                    connection = self._connect()
+                except smtplib.SMTPException as e:
+                    errors.append(e)
+        except Exception as e:
+            # Could not connect or reconnect - the messages not yet tried fail with it
+            errors.extend([e] * (len(messages) - len(errors)))
+        finally:
+            if connection is not None:
+                self.idle.put(connection)
+        return errors
+    
+    async def send_batch(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._send_batch, messages)
+    
+    def close(self):
+        while not self.idle.empty():
+            try:
+                self.idle.get_nowait().quit()
+            except (queue.Empty, smtplib.SMTPException, OSError):
+                pass
+        self.executor.shutdown(wait=False)
+
+class LogTransport:
+    """Logs outgoing mail instead of sending it - for development, with EMAIL_TRANSPORT=log"""
+    async def send_batch(self, messages: List[MIMEMultipart]) -> List[Optional[Exception]]:
+        for message in messages:
+            logger.info(f"Email to {message['To']}: {message['Subject']}")
+        return [None] * len(messages)
+    
+    def close(self):
+        pass
+
+class EmailSender:
+    """Batches outgoing mail through a transport under a messages-per-second rate limit.
+    
+    send() resolves once the message is accepted and raises if delivery failed, so callers
+    running on the task queue get its retries.
+    """
+    def __init__(self, transport, from_address: str, batch_size: int, batch_window_seconds: float, rate_per_second: float):
+        self.transport = transport
+        self.from_address = from_address
+        self.batch_size = batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self.rate_per_second = rate_per_second
+        self.pending: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.next_send_at = 0.0
+        self.sent = 0
+        self.failed = 0
+    
+    async def send(self, to: str, subject: str, body: str):
+        message = MIMEMultipart()
+        message["From"] = self.from_address
+        message["To"] = to
+        message["Subject"] = subject
+        message.attach(MIMEText(body, "plain"))
+        
+        if self.worker is None or self.worker.done():
+            self.pending = asyncio.Queue()
+            self.worker = asyncio.create_task(self.run())
+        delivered = asyncio.get_running_loop().create_future()
+        await self.pending.put((message, delivered))
+        await delivered
+    
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            deadline = loop.time() + self.batch_window_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(await asyncio.wait_for(self.pending.get(), timeout=max(deadline - loop.time(), 0)))
+                except asyncio.TimeoutError:
+                    break
+            
+            await asyncio.sleep(max(self.next_send_at - loop.time(), 0))
+            self.next_send_at = loop.time() + len(batch) / self.rate_per_second
+            
+            try:
+                errors = await self.transport.send_batch([message for message, _ in batch])
+            except Exception as e:
+                errors = [e] * len(batch)
+            for (message, delivered), error in zip(batch, errors):
+                if delivered.done():
+                    continue
+                if error is None:
+                    self.sent += 1
+                    delivered.set_result(None)
+                else:
+                    self.failed += 1
+                    delivered.set_exception(error)
+    
+    def stats(self) -> Dict:
+        return {
+            "transport": type(self.transport).__name__ if self.transport else None,
+            "queued": self.pending.qsize() if self.pending else 0,
+            "sent": self.sent,
+            "failed": self.failed
+        }
+    
+    def close(self):
+        if self.worker:
+            self.worker.cancel()
+        if self.transport:
+            self.transport.close()
+
+# Password reset codes only reach users by email, so there is no silent default: set SMTP_HOST
+# (plus SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_USE_TLS as needed) or EMAIL_TRANSPORT=log.
+EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT', 'smtp' if os.environ.get('SMTP_HOST') else '')
+if EMAIL_TRANSPORT == 'smtp':
+    email_transport = SMTPTransport(
+        os.environ.get('SMTP_HOST', 'localhost'),
+        int(os.environ.get('SMTP_PORT', 587)),
+        os.environ.get('SMTP_USERNAME'),
+        os.environ.get('SMTP_PASSWORD'),
+        use_tls=os.environ.get('SMTP_USE_TLS', 'true').lower() == 'true',
+        pool_size=int(os.environ.get('SMTP_POOL_SIZE', 2)),
+        timeout=float(os.environ.get('SMTP_TIMEOUT_SECONDS', 10))
+    )
+elif EMAIL_TRANSPORT == 'log':
+    email_transport = LogTransport()
+else:
+    email_transport = None
+email_sender = EmailSender(
+    email_transport,
+    from_address=os.environ.get('EMAIL_FROM', SUPPORT_EMAIL),
+    batch_size=int(os.environ.get('EMAIL_BATCH_SIZE', 20)),
+    batch_window_seconds=float(os.environ.get('EMAIL_BATCH_WINDOW_SECONDS', 0.5)),
+    rate_per_second=float(os.environ.get('EMAIL_RATE_PER_SECOND', 5))
+)
+
+# JSON responses
+def _json_default(value):
+    # orjson handles datetime, UUID and numpy natively - these are the stragglers
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson rendering that also accepts ObjectIds, sets and Pydantic models"""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+def fast_json(content, response: Optional[Response] = None) -> FastJSONResponse:
+    """Render documents straight from Mongo, skipping response-model validation and jsonable_encoder.
+    
+    Only for data whose shape the database already guarantees. Headers set on the endpoint's
+    injected `response` (e.g. X-Next-Cursor) are carried over.
+    """
+    return FastJSONResponse(content, headers=dict(response.headers) if response else None)
+
 # Create the main app
-app = FastAPI(title="BuildBidz API", version="1.0.0")
+app = FastAPI(title="BuildBidz API", version="1.0.0", default_response_class=FastJSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # Models
@@ -169,16 +580,94 @@ class ChatMessage(BaseModel):
     file_attachments: List[Dict] = []  # List of file attachment metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
     read: bool = False
+    seq: Optional[int] = None  # Per-job order assigned on insert; chat sync pages on it
 
 class ChatMessageCreate(BaseModel):
     message: str
 
 # Utility functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt so hashing never blocks the event loop.
+    
+    bcrypt releases the GIL while it works, so threads run hashes in parallel.
+    """
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.completed = 0
+    
+    async def run(self, fn, *args):
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+    
+    def stats(self) -> Dict:
+        return {
+            "max_workers": self.max_workers,
+            "running": min(self.in_flight, self.max_workers),
+            "queue_depth": max(self.in_flight - self.max_workers, 0),
+            "completed": self.completed
+        }
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+password_hash_pool = PasswordHashPool(max_workers=int(os.environ.get('PASSWORD_HASH_WORKERS', 4)))
+
+async def hash_password(password: str) -> str:
+    return await password_hash_pool.run(pwd_context.hash, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+class UserCache:
+    """In-process LRU cache of authenticated users with a short TTL.
+    
+    Endpoints that change a user's stored profile or credentials must call invalidate().
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, user_id: str) -> Optional["User"]:
+        entry = self.entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[user_id]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, user_id: str, user: "User"):
+        self.entries[user_id] = (time.monotonic() + self.ttl_seconds, user)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+    
+    def invalidate(self, user_id: str):
+        self.entries.pop(user_id, None)
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+user_cache = UserCache(
+    max_size=int(os.environ.get('USER_CACHE_MAX_SIZE', 10000)),
+    ttl_seconds=float(os.environ.get('USER_CACHE_TTL_SECONDS', 60))
+)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -191,10 +680,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await get_user_from_token(credentials.credentials)
+
+async def get_user_from_token(token: str, scope: Optional[str] = None) -> User:
+    """The user a token belongs to; single-purpose tokens (with a "scope" claim) only pass where that scope is asked for"""
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         user_id: str = payload.get("sub")
-        if user_id is None:
+        if user_id is None or payload.get("scope") != scope:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
         
         # Handle admin user separately
@@ -236,10 +729,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             )
             return salesman_user
         
-        user = await db.users.find_one({"id": user_id})
+        cached_user = user_cache.get(user_id)
+        if cached_user is not None:
+            return cached_user
+        
+        user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
-        return User(**user)
+        user_obj = User(**user)
+        user_cache.set(user_id, user_obj)
+        return user_obj
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
@@ -281,6 +780,71 @@ async def require_active_subscription_or_trial(current_user: User = Depends(requ
     
     raise HTTPException(status_code=402, detail="Active subscription or trial required")
 
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe cursor"""
+    raw = json.dumps({"t": created_at.isoformat(), "id": doc_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(data["t"]), str(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+MAX_PAGE_SIZE = 1000
+
+def keyset_filter(cursor: Optional[str], sort_fields: tuple = ("created_at", "id")) -> Dict:
+    """Filter for documents after `cursor` in (timestamp, id) descending order"""
+    if not cursor:
+        return {}
+    time_field, id_field = sort_fields
+    moment, doc_id = decode_cursor(cursor)
+    return {"$or": [
+        {time_field: {"$lt": moment}},
+        {time_field: moment, id_field: {"$lt": doc_id}}
+    ]}
+
+async def fetch_page(
+    collection,
+    query: Dict,
+    cursor: Optional[str],
+    limit: int,
+    response: Response,
+    projection: Optional[Dict] = None,
+    sort_fields: tuple = ("created_at", "id")
+) -> List[Dict]:
+    """Keyset pagination on (created_at, id) - or another (timestamp, id) pair - newest first.
+    
+    When more results remain, the cursor for the next page is set in the X-Next-Cursor header.
+    """
+    time_field, id_field = sort_fields
+    query = {**query, **keyset_filter(cursor, sort_fields)}
+    docs = await collection.find(query, projection).sort([(time_field, -1), (id_field, -1)]).to_list(limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(docs[-1][time_field], docs[-1][id_field])
+    return docs
+
+USER_FIELDS = list(User.model_fields)
+JOB_FIELDS = list(JobPost.model_fields)
+# Salesman bids also carry the company they were submitted for
+BID_FIELDS = list(Bid.model_fields) + ["bid_type", "company_details"]
+
+def field_projection(fields: Optional[str], allowed: List[str]) -> Dict:
+    """Mongo projection for a comma-separated `fields` parameter - every allowed field when it's absent.
+    
+    id and created_at are always included since keyset pagination needs them.
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = sorted(set(selected) - set(allowed))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        selected = allowed
+    return {"_id": 0, "id": 1, "created_at": 1, **{field: 1 for field in selected}}
+
 def generate_reset_code():
     return str(secrets.randbelow(1000000)).zfill(6)
 
@@ -300,6 +864,410 @@ def validate_business_address(address: str) -> bool:
         return False
     return True
 
+# Transactions
+_transactions_supported: Optional[bool] = None
+
+async def supports_transactions() -> bool:
+    """Multi-document transactions need a replica set or sharded cluster - standalone servers reject them"""
+    global _transactions_supported
+    if _transactions_supported is None:
+        try:
+            hello = await client.admin.command("hello")
+            _transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+        except Exception:
+            _transactions_supported = False
+    return _transactions_supported
+
+async def run_in_transaction(operations):
+    """Run `operations(session)` in a transaction when the deployment supports one, otherwise without a session"""
+    if not await supports_transactions():
+        return await operations(None)
+    async with await client.start_session() as session:
+        return await session.with_transaction(operations)
+
+# Worker leases
+# Jobs that every worker would otherwise start at once (backfills, reconciliation) run under a named lease
+WORKER_ID = str(uuid.uuid4())
+CONVERSATION_BACKFILL_LEASE_SECONDS = 3600
+
+async def acquire_lease(name: str, seconds: int) -> bool:
+    """Take or renew the named lease for this worker; False while another worker holds it"""
+    now = datetime.utcnow()
+    try:
+        await db.leases.find_one_and_update(
+            {"id": name, "$or": [{"expires_at": {"$lt": now}}, {"holder": WORKER_ID}]},
+            {"$set": {"holder": WORKER_ID, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The lease exists and is held elsewhere, so the upsert collided with it
+        return False
+    return True
+
+async def release_lease(name: str):
+    await db.leases.update_one({"id": name, "holder": WORKER_ID}, {"$set": {"expires_at": datetime.utcnow()}})
+
+# Request-scoped batch loaders
+class DataLoader:
+    """Coalesces lookups by key into one `$in` query per event-loop tick.
+    
+    Results are memoized for the lifetime of the loader, which is a single request.
+    """
+    def __init__(self, collection, key: str = "id", query: Optional[Dict] = None, projection: Optional[Dict] = None):
+        self.collection = collection
+        self.key = key
+        self.query = query or {}
+        self.projection = projection or {"_id": 0}
+        self.cache: Dict[str, asyncio.Future] = {}
+        self.pending: List[str] = []
+        # The event loop only keeps weak references to tasks - hold in-flight dispatches until they finish
+        self.dispatches: set = set()
+    
+    def _start_dispatch(self):
+        task = asyncio.ensure_future(self._dispatch())
+        self.dispatches.add(task)
+        task.add_done_callback(self.dispatches.discard)
+    
+    def _enqueue(self, key: str) -> asyncio.Future:
+        if key in self.cache:
+            return self.cache[key]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.cache[key] = future
+        if not self.pending:
+            # First key this tick - dispatch once the current callbacks have queued theirs
+            loop.call_soon(self._start_dispatch)
+        self.pending.append(key)
+        return future
+    
+    async def _dispatch(self):
+        keys, self.pending = self.pending, []
+        try:
+            docs = await self.collection.find(
+                {**self.query, self.key: {"$in": keys}}, self.projection
+            ).to_list(None)
+        except Exception as e:
+            for key in keys:
+                self.cache.pop(key).set_exception(e)
+            return
+        found = {}
+        for doc in docs:
+            found.setdefault(doc[self.key], doc)
+        for key in keys:
+            self.cache[key].set_result(found.get(key))
+    
+    def prime(self, key: str, doc: Dict):
+        if key not in self.cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(doc)
+            self.cache[key] = future
+    
+    async def load(self, key: str) -> Optional[Dict]:
+        return await self._enqueue(key)
+    
+    async def load_many(self, keys) -> List[Optional[Dict]]:
+        return list(await asyncio.gather(*[self._enqueue(key) for key in keys]))
+
+class Loaders:
+    def __init__(self):
+        self.users = DataLoader(db.users, projection={"_id": 0, "password": 0})
+        self.jobs = DataLoader(db.jobs)
+        self.bids = DataLoader(db.bids)
+        self.awarded_bids = DataLoader(db.bids, key="job_id", query={"status": "awarded"})
+
+async def get_loaders() -> Loaders:
+    return Loaders()
+
+# Real-time event bus
+class EventBus:
+    """Pub/sub that fans events out to each user's open stream connections.
+    
+    Every connection gets its own bounded queue, so one worker can hold many idle
+    streams cheaply. Events reach this process's streams at once and are also written
+    to the capped `events` collection, which every other process tails - so a notification
+    created by a task on one worker reaches a stream held by another.
+    """
+    def __init__(self, queue_size: int = 100, relay_bytes: int = 16 * 1024 * 1024):
+        self.queue_size = queue_size
+        self.relay_bytes = relay_bytes
+        self.subscribers: Dict[str, set] = {}
+        self.relay_task: Optional[asyncio.Task] = None
+    
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self.subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[user_id]
+    
+    def deliver(self, user_ids, event: Dict):
+        for user_id in user_ids:
+            for queue in list(self.subscribers.get(user_id, ())):
+                if queue.full():
+                    # Slow consumer - drop its oldest event rather than block publishers
+                    queue.get_nowait()
+                queue.put_nowait(event)
+    
+    async def publish(self, user_ids, event_type: str, data: Dict):
+        event = {"type": event_type, "data": jsonable_encoder(data)}
+        user_ids = list(set(user_ids))
+        self.deliver(user_ids, event)
+        if self.relay_task:
+            await db.events.insert_one({**event, "user_ids": user_ids, "origin": WORKER_ID, "created_at": datetime.utcnow()})
+    
+    async def start_relay(self):
+        """Create the capped events collection if needed and start tailing it"""
+        try:
+            await db.create_collection("events", capped=True, size=self.relay_bytes)
+            # A tailable cursor on an empty collection dies at once - give it something to sit on
+            await db.events.insert_one({"type": None, "data": None, "user_ids": [], "origin": None, "created_at": datetime.utcnow()})
+        except CollectionInvalid:
+            pass
+        except Exception as e:
+            logger.warning(f"Event relay unavailable, events only reach streams on their own worker: {e}")
+            return
+        self.relay_task = asyncio.create_task(self.relay())
+    
+    async def relay(self):
+        """Deliver events published by other processes, in insertion order"""
+        latest = await db.events.find_one({}, sort=[("$natural", -1)])
+        last_id, last_at = (latest["_id"], latest["created_at"]) if latest else (None, datetime.min)
+        while True:
+            try:
+                # A reopened cursor starts from the oldest event - skip up to the last one handled
+                skipping = last_id is not None
+                async for doc in db.events.find({}, cursor_type=CursorType.TAILABLE_AWAIT):
+                    if skipping:
+                        skipping = doc["_id"] != last_id and doc["created_at"] <= last_at
+                        if skipping or doc["_id"] == last_id:
+                            continue
+                    last_id, last_at = doc["_id"], doc["created_at"]
+                    if doc["origin"] != WORKER_ID:
+                        self.deliver(doc["user_ids"], {"type": doc["type"], "data": doc["data"]})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event relay failed: {e}")
+            await asyncio.sleep(EVENT_RELAY_RETRY_SECONDS)
+    
+    def stop_relay(self):
+        if self.relay_task:
+            self.relay_task.cancel()
+            self.relay_task = None
+
+event_bus = EventBus()
+EVENT_RELAY_RETRY_SECONDS = 1
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+EVENT_STREAM_TOKEN_SECONDS = 60
+
+@api_router.post("/events/token")
+async def create_event_stream_token(current_user: User = Depends(get_current_user)):
+    """Short-lived token that only opens the event stream, so the login JWT stays out of URLs and access logs"""
+    token = create_access_token(
+        {"sub": current_user.id, "scope": "events"},
+        expires_delta=timedelta(seconds=EVENT_STREAM_TOKEN_SECONDS)
+    )
+    return {"token": token, "expires_in": EVENT_STREAM_TOKEN_SECONDS}
+
+@api_router.get("/events/stream")
+async def event_stream(request: Request, token: str):
+    """Server-Sent Events stream of chat messages, read receipts and notifications.
+    
+    EventSource cannot send an Authorization header, so `token` comes from POST /events/token -
+    it expires within a minute and is rejected everywhere else. It is only checked on connect.
+    """
+    current_user = await get_user_from_token(token, scope="events")
+    queue = event_bus.subscribe(current_user.id)
+    
+    async def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=EVENT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            event_bus.unsubscribe(current_user.id, queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Background task queue
+class TaskQueue:
+    """Durable in-process queue for side effects that shouldn't hold up a request.
+    
+    Tasks are persisted in the `tasks` collection before they run, claimed by a fixed
+    number of workers, retried with exponential backoff and picked up again after a
+    restart. Handlers must be idempotent - a task can run more than once.
+    
+    Idle workers back off from poll_seconds to max_poll_seconds between polls. Enqueues in this
+    process wake them at once; on a replica set a change stream does the same for other processes.
+    """
+    def __init__(self, concurrency: int, max_attempts: int, lock_seconds: float, poll_seconds: float = 5.0, max_poll_seconds: float = 60.0):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        self.max_poll_seconds = max_poll_seconds
+        self.handlers: Dict[str, callable] = {}
+        self.workers: List[asyncio.Task] = []
+        self.watcher: Optional[asyncio.Task] = None
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        self.completed = 0
+        self.failed = 0
+    
+    def handler(self, name: str):
+        def register(func):
+            self.handlers[name] = func
+            return func
+        return register
+    
+    async def enqueue(self, name: str, payload: Dict, session=None) -> str:
+        """Persist a task. Inside a transaction pass its session and call wake() after it commits."""
+        now = datetime.utcnow()
+        task_id = str(uuid.uuid4())
+        await db.tasks.insert_one({
+            "id": task_id,
+            "name": name,
+            "payload": payload,
+            "status": "pending",
+            "attempts": 0,
+            "run_at": now,
+            "created_at": now
+        }, session=session)
+        if session is None:
+            self.wake()
+        return task_id
+    
+    def wake(self):
+        self.wakeup.set()
+    
+    async def claim(self) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await db.tasks.find_one_and_update(
+            {"$or": [
+                {"status": "pending", "run_at": {"$lte": now}},
+                # Left running by a worker that died
+                {"status": "running", "locked_at": {"$lt": now - timedelta(seconds=self.lock_seconds)}}
+            ]},
+            {"$set": {"status": "running", "locked_at": now}, "$inc": {"attempts": 1}},
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def run(self, task: Dict):
+        try:
+            await self.handlers[task["name"]](**task["payload"])
+        except asyncio.CancelledError:
+            # Interrupted by shutdown - hand it back without spending an attempt
+            await db.tasks.update_one({"id": task["id"]}, {"$set": {"status": "pending"}, "$inc": {"attempts": -1}})
+            raise
+        except Exception as e:
+            if task["attempts"] >= self.max_attempts:
+                self.failed += 1
+                logger.error(f"Task {task['name']} {task['id']} failed permanently: {e}")
+                update = {"status": "failed", "finished_at": datetime.utcnow()}
+            else:
+                update = {"status": "pending", "run_at": datetime.utcnow() + timedelta(seconds=2 ** task["attempts"])}
+            await db.tasks.update_one({"id": task["id"]}, {"$set": {**update, "last_error": str(e)}})
+            return
+        self.completed += 1
+        await db.tasks.update_one({"id": task["id"]}, {"$set": {"status": "done", "finished_at": datetime.utcnow()}})
+    
+    async def work(self):
+        idle_seconds = self.poll_seconds
+        while not self.stopping:
+            try:
+                task = await self.claim()
+            except Exception as e:
+                logger.error(f"Task claim failed: {e}")
+                task = None
+            if task is None:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=idle_seconds)
+                    idle_seconds = self.poll_seconds
+                except asyncio.TimeoutError:
+                    idle_seconds = min(idle_seconds * 2, self.max_poll_seconds)
+                continue
+            idle_seconds = self.poll_seconds
+            await self.run(task)
+    
+    async def watch(self):
+        """Wake the workers whenever any process enqueues a task"""
+        try:
+            async with db.tasks.watch([{"$match": {"operationType": "insert"}}]) as stream:
+                async for _ in stream:
+                    self.wake()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Polling still picks tasks up, just later
+            logger.warning(f"Task change stream stopped: {e}")
+    
+    async def start_watcher(self):
+        # Change streams need a replica set - the same deployments that support transactions
+        if await supports_transactions():
+            self.watcher = asyncio.create_task(self.watch())
+    
+    def start(self):
+        self.stopping = False
+        self.workers = [asyncio.create_task(self.work()) for _ in range(self.concurrency)]
+    
+    async def drain(self, timeout: float):
+        """Stop claiming new tasks and give in-flight ones `timeout` seconds to finish"""
+        self.stopping = True
+        self.wake()
+        if self.watcher:
+            self.watcher.cancel()
+            self.watcher = None
+        if not self.workers:
+            return
+        done, pending = await asyncio.wait(self.workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self.workers = []
+    
+    def stats(self) -> Dict:
+        return {
+            "workers": len(self.workers),
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+task_queue = TaskQueue(
+    concurrency=int(os.environ.get('TASK_QUEUE_CONCURRENCY', 4)),
+    max_attempts=int(os.environ.get('TASK_MAX_ATTEMPTS', 5)),
+    lock_seconds=float(os.environ.get('TASK_LOCK_SECONDS', 300)),
+    max_poll_seconds=float(os.environ.get('TASK_MAX_POLL_SECONDS', 60))
+)
+TASK_DRAIN_SECONDS = float(os.environ.get('TASK_DRAIN_SECONDS', 10))
+
+@task_queue.handler("delete_files")
+async def delete_files_task(paths: List[str]):
+    for path in paths:
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+
 # Auth endpoints
 @api_router.post("/auth/register")
 async def register(user_data: UserCreate):
@@ -323,7 +1291,7 @@ async def register(user_data: UserCreate):
         )
     
     # Create user with 1-month free trial for buyers
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     trial_expires = datetime.utcnow() + timedelta(days=30) if user_data.role == UserRole.BUYER else None
     
     user = User(
@@ -339,6 +1307,7 @@ async def register(user_data: UserCreate):
     )
     
     await db.users.insert_one({**user.dict(), "password": hashed_password})
+    await bump_counters({GLOBAL_COUNTERS: {"total_users": 1}})
     
     # Create access token
     access_token = create_access_token(data={"sub": user.id})
@@ -413,7 +1382,7 @@ async def login(login_data: UserLogin):
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    if not verify_password(login_data.password, user["password"]):
+    if not await verify_password(login_data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     access_token = create_access_token(data={"sub": user["id"]})
@@ -426,14 +1395,33 @@ async def login(login_data: UserLogin):
     }
 
 # Password reset endpoints
+@task_queue.handler("send_reset_code")
+async def send_reset_code_task(reset_id: str):
+    """Email a reset code, read from password_resets so the code itself never sits in the task payload"""
+    reset = await db.password_resets.find_one({"id": reset_id, "used": False, "expires_at": {"$gt": datetime.utcnow()}})
+    if reset is None:
+        # Used, expired or replaced by a newer code - nothing worth sending
+        return
+    await email_sender.send(
+        reset["email"],
+        "Your BuildBidz password reset code",
+        f"Your password reset code is {reset['reset_code']}.\n\n"
+        "It expires in 15 minutes. If you didn't ask to reset your password, you can ignore this email."
+    )
+
 @api_router.post("/auth/forgot-password")
 async def forgot_password(reset_data: PasswordReset):
+    if email_sender.transport is None:
+        logger.error("Password reset requested but no email transport is configured - set SMTP_HOST or EMAIL_TRANSPORT")
+        raise HTTPException(status_code=503, detail="Password reset by email is not available right now")
+    
     user = await db.users.find_one({"email": reset_data.email})
     if not user:
         # Don't reveal if email exists or not
         return {"message": "If the email exists, a reset code has been sent"}
     
     reset_code = generate_reset_code()
+    reset_id = str(uuid.uuid4())
     expires_at = datetime.utcnow() + timedelta(minutes=15)
     
     # Store reset code in database
@@ -441,6 +1429,7 @@ async def forgot_password(reset_data: PasswordReset):
         {"email": reset_data.email},
         {
             "$set": {
+                "id": reset_id,
                 "reset_code": reset_code,
                 "expires_at": expires_at,
                 "used": False
@@ -449,8 +1438,9 @@ async def forgot_password(reset_data: PasswordReset):
         upsert=True
     )
     
-    # In a real app, send email with reset code
-    # For now, we'll just return success (code will be in database)
+    # Delivered from the task queue so a slow or failing mail server can't hold up the request
+    await task_queue.enqueue("send_reset_code", {"reset_id": reset_id})
+    
     return {"message": "If the email exists, a reset code has been sent"}
 
 @api_router.post("/auth/reset-password")
@@ -466,14 +1456,16 @@ async def reset_password(reset_data: PasswordResetConfirm):
         raise HTTPException(status_code=400, detail="Invalid or expired reset code")
     
     # Update user password
-    hashed_password = hash_password(reset_data.new_password)
-    result = await db.users.update_one(
+    hashed_password = await hash_password(reset_data.new_password)
+    user = await db.users.find_one_and_update(
         {"email": reset_data.email},
-        {"$set": {"password": hashed_password}}
+        {"$set": {"password": hashed_password}},
+        projection={"id": 1}
     )
     
-    if result.modified_count == 0:
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.invalidate(user["id"])
     
     # Mark reset code as used
     await db.password_resets.update_one(
@@ -532,6 +1524,16 @@ async def update_profile(profile_data: UserUpdate, current_user: User = Depends(
             {"id": current_user.id},
             {"$set": update_data}
         )
+        user_cache.invalidate(current_user.id)
+    
+    if 'company_name' in update_data:
+        # Keep the participant snapshots in chat summaries current
+        await db.conversations.update_many(
+            {"participant_ids": current_user.id},
+            {"$set": {f"participants.{current_user.id}.company_name": update_data['company_name']}}
+        )
+    if update_data:
+        await bump_versions("users", "conversations")
     
     return {"message": "Profile updated successfully"}
 
@@ -546,98 +1548,204 @@ async def change_password(password_data: PasswordChange, current_user: User = De
         raise HTTPException(status_code=404, detail="User not found")
     
     # Verify current password
-    if not verify_password(password_data.current_password, user["password"]):
+    if not await verify_password(password_data.current_password, user["password"]):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Update password
-    hashed_password = hash_password(password_data.new_password)
+    hashed_password = await hash_password(password_data.new_password)
     await db.users.update_one(
         {"id": current_user.id},
         {"$set": {"password": hashed_password}}
     )
+    user_cache.invalidate(current_user.id)
     
     return {"message": "Password changed successfully"}
 
 # Admin endpoints
 @api_router.get("/admin/users")
-async def get_all_users(current_user: User = Depends(require_admin)):
-    users = await db.users.find().to_list(1000)
-    return [User(**user) for user in users]
+async def get_all_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user: User = Depends(require_admin)
+):
+    """All users, newest first. `fields` (comma-separated) limits each user to those columns."""
+    users = await fetch_page(db.users, {}, cursor, limit, response, field_projection(fields, USER_FIELDS))
+    return fast_json(users, response)
+
+USER_DETAIL_DESCRIPTION_CHARS = 280
 
 @api_router.get("/admin/users/{user_id}/details")
-async def get_user_details(user_id: str, current_user: User = Depends(require_admin)):
-    user = await db.users.find_one({"id": user_id})
+async def get_user_details(
+    user_id: str,
+    jobs_cursor: Optional[str] = None,
+    bids_cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    description_chars: int = Query(USER_DETAIL_DESCRIPTION_CHARS, ge=0, le=10000),
+    current_user: User = Depends(require_admin)
+):
+    """Profile, a page each of the user's jobs and bids, and bid totals - fetched concurrently.
+    
+    Job descriptions are cut to `description_chars`. Pass next_jobs_cursor / next_bids_cursor back to page on.
+    """
+    page_sort = {"created_at": -1, "id": -1}
+    job_fields = {
+        "_id": 0, "id": 1, "title": 1, "category": 1, "quantity": 1, "location": 1, "delivery_timeline": 1,
+        "budget_range": 1, "posted_by": 1, "status": 1, "created_at": 1,
+        "description": {"$substrCP": [{"$ifNull": ["$description", ""]}, 0, description_chars]},
+        "description_truncated": {"$gt": [{"$strLenCP": {"$ifNull": ["$description", ""]}}, description_chars]}
+    }
+    bid_fields = {
+        "_id": 0, "id": 1, "job_id": 1, "supplier_id": 1, "price_quote": 1, "delivery_estimate": 1,
+        "notes": 1, "status": 1, "created_at": 1, "bid_type": 1, "company_details": 1
+    }
+    
+    user, job_facets, bid_facets = await asyncio.gather(
+        db.users.find_one({"id": user_id}, {"_id": 0, "password": 0}),
+        db.jobs.aggregate([
+            {"$match": {"posted_by": user_id}},
+            {"$facet": {
+                "page": [{"$match": keyset_filter(jobs_cursor)}, {"$sort": page_sort}, {"$limit": limit + 1}, {"$project": job_fields}],
+                "total": [{"$count": "count"}]
+            }}
+        ]).to_list(1),
+        db.bids.aggregate([
+            {"$match": {"supplier_id": user_id}},
+            {"$facet": {
+                "page": [{"$match": keyset_filter(bids_cursor)}, {"$sort": page_sort}, {"$limit": limit + 1}, {"$project": bid_fields}],
+                "totals": [{"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "awarded": {"$sum": {"$cond": [{"$eq": ["$status", "awarded"]}, 1, 0]}},
+                    "total_value": {"$sum": "$price_quote"},
+                    "awarded_value": {"$sum": {"$cond": [{"$eq": ["$status", "awarded"]}, "$price_quote", 0]}}
+                }}]
+            }}
+        ]).to_list(1)
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's jobs and bids
-    jobs = await db.jobs.find({"posted_by": user_id}).to_list(100)
-    bids = await db.bids.find({"supplier_id": user_id}).to_list(100)
+    def page(docs: List[Dict]):
+        if len(docs) > limit:
+            docs = docs[:limit]
+            return docs, encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+        return docs, None
+    
+    jobs, next_jobs_cursor = page(job_facets[0]["page"])
+    bids, next_bids_cursor = page(bid_facets[0]["page"])
+    job_total = job_facets[0]["total"]
+    bid_totals = bid_facets[0]["totals"][0] if bid_facets[0]["totals"] else {}
     
     return {
         "user": User(**user),
-        "jobs_posted": len(jobs),
-        "bids_submitted": len(bids),
-        "jobs": [JobPost(**job) for job in jobs],
-        "bids": [{k: v for k, v in bid.items() if k != '_id'} for bid in bids]
+        "jobs_posted": job_total[0]["count"] if job_total else 0,
+        "bids_submitted": bid_totals.get("count", 0),
+        "bids_awarded": bid_totals.get("awarded", 0),
+        "total_bid_value": bid_totals.get("total_value", 0),
+        "awarded_bid_value": bid_totals.get("awarded_value", 0),
+        "jobs": jobs,
+        "bids": bids,
+        "next_jobs_cursor": next_jobs_cursor,
+        "next_bids_cursor": next_bids_cursor
     }
 
 @api_router.delete("/admin/users/{user_id}")
 async def delete_user(user_id: str, current_user: User = Depends(require_admin)):
-    result = await db.users.delete_one({"id": user_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Also delete user's jobs and bids
-    await db.jobs.delete_many({"posted_by": user_id})
-    await db.bids.delete_many({"supplier_id": user_id})
-    
-    return {"message": "User deleted successfully"}
+    """Delete the account now and everything that hangs off it in a background cascade"""
+    async def remove_user(session):
+        result = await db.users.delete_one({"id": user_id}, session=session)
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="User not found")
+        # The cascade works from this list; closing the jobs stops new bids arriving before it reaches them
+        jobs = await db.jobs.find(
+            {"posted_by": user_id}, {"_id": 0, **{field: 1 for field in CASCADE_JOB_FIELDS}}, session=session
+        ).to_list(None)
+        open_job_ids = [job["id"] for job in jobs if job.get("status") == "open"]
+        if open_job_ids:
+            await db.jobs.update_many({"id": {"$in": open_job_ids}}, {"$set": {"status": "closed"}}, session=session)
+            await bump_job_facets([job for job in jobs if job["id"] in open_job_ids], -1, session=session)
+            await set_conversation_job_status(open_job_ids, "closed", session=session)
+        deletion = new_deletion("user", user_id, jobs)
+        await db.deletions.insert_one(dict(deletion), session=session)
+        await bump_counters({GLOBAL_COUNTERS: {"total_users": -1}}, session=session)
+        await task_queue.enqueue("cascade_delete", {"deletion_id": deletion["id"]}, session=session)
+        return deletion
+    
+    deletion = await run_in_transaction(remove_user)
+    task_queue.wake()
+    user_cache.invalidate(user_id)
+    await bump_versions("users", "jobs", "conversations")
+    
+    return {"message": "User deleted successfully", "deletion_id": deletion["id"]}
 
 @api_router.get("/admin/jobs")
-async def get_all_jobs(current_user: User = Depends(require_admin)):
-    jobs = await db.jobs.find().sort("created_at", -1).to_list(1000)
-    
-    # Enrich with user info and convert ObjectIds
-    enriched_jobs = []
-    for job in jobs:
-        # Remove MongoDB ObjectId if present
-        job_dict = {k: v for k, v in job.items() if k != '_id'}
-        
-        user = await db.users.find_one({"id": job_dict["posted_by"]})
-        job_dict["posted_by_info"] = {
+async def get_all_jobs(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user: User = Depends(require_admin),
+    loaders: Loaders = Depends(get_loaders)
+):
+    projection = field_projection(fields, JOB_FIELDS + ["posted_by_info"])
+    with_owner = projection.pop("posted_by_info", None)
+    if with_owner:
+        projection["posted_by"] = 1
+    jobs = await fetch_page(db.jobs, {}, cursor, limit, response, projection)
+    if not with_owner:
+        return fast_json(jobs, response)
+    
+    # Enrich with user info
+    users = await loaders.users.load_many([job["posted_by"] for job in jobs])
+    for job, user in zip(jobs, users):
+        job["posted_by_info"] = {
             "company_name": user["company_name"],
             "email": user["email"],
             "contact_phone": user["contact_phone"]
         } if user else None
-        enriched_jobs.append(job_dict)
     
-    return enriched_jobs
+    return fast_json(jobs, response)
 
 @api_router.delete("/admin/jobs/{job_id}")
 async def delete_job(job_id: str, current_user: User = Depends(require_admin)):
-    result = await db.jobs.delete_one({"id": job_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Also delete related bids
-    await db.bids.delete_many({"job_id": job_id})
-    
-    return {"message": "Job deleted successfully"}
+    """Delete the job now and its bids, chat and files in a background cascade"""
+    async def remove_job(session):
+        job = await db.jobs.find_one_and_delete({"id": job_id}, session=session)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if job.get("status") == "open":
+            await bump_job_facets([job], -1, session=session)
+        # The job document is gone by the time the cascade runs - keep what its counters and preferences need
+        deletion = new_deletion("job", job_id, [{field: job.get(field) for field in CASCADE_JOB_FIELDS}])
+        await db.deletions.insert_one(dict(deletion), session=session)
+        await task_queue.enqueue("cascade_delete", {"deletion_id": deletion["id"]}, session=session)
+        return deletion
+    
+    deletion = await run_in_transaction(remove_job)
+    task_queue.wake()
+    await bump_versions("jobs")
+    
+    return {"message": "Job deleted successfully", "deletion_id": deletion["id"]}
 
 @api_router.get("/admin/bids")
-async def get_all_bids(current_user: User = Depends(require_admin)):
-    bids = await db.bids.find().sort("created_at", -1).to_list(1000)
+async def get_all_bids(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(require_admin),
+    loaders: Loaders = Depends(get_loaders)
+):
+    bids = await fetch_page(db.bids, {}, cursor, limit, response, {"_id": 0})
+    suppliers, jobs = await asyncio.gather(
+        loaders.users.load_many([bid["supplier_id"] for bid in bids]),
+        loaders.jobs.load_many([bid["job_id"] for bid in bids])
+    )
     
-    # Enrich with user and job info and convert ObjectIds
+    # Enrich with user and job info
     enriched_bids = []
-    for bid in bids:
-        # Remove MongoDB ObjectId if present
-        bid_dict = {k: v for k, v in bid.items() if k != '_id'}
-        
-        supplier = await db.users.find_one({"id": bid_dict["supplier_id"]})
-        job = await db.jobs.find_one({"id": bid_dict["job_id"]})
-        
+    for bid_dict, supplier, job in zip(bids, suppliers, jobs):
         bid_dict["supplier_info"] = {
             "company_name": supplier["company_name"],
             "email": supplier["email"],
@@ -651,25 +1759,200 @@ async def get_all_bids(current_user: User = Depends(require_admin)):
         
         enriched_bids.append(bid_dict)
     
-    return enriched_bids
+    return fast_json(enriched_bids, response)
 
 @api_router.delete("/admin/bids/{bid_id}")
 async def delete_bid(bid_id: str, current_user: User = Depends(require_admin)):
-    result = await db.bids.delete_one({"id": bid_id})
-    if result.deleted_count == 0:
+    bid = await db.bids.find_one_and_delete({"id": bid_id})
+    if not bid:
         raise HTTPException(status_code=404, detail="Bid not found")
     
+    counter_changes = {
+        GLOBAL_COUNTERS: {"total_bids": -1},
+        bid["supplier_id"]: {"total_bids": -1, "won_bids": -1 if bid.get("status") == "awarded" else 0}
+    }
+    job = await db.jobs.find_one({"id": bid["job_id"]}, {"_id": 0, "posted_by": 1, "category": 1, "location": 1})
+    if job:
+        counter_changes.setdefault(job["posted_by"], {})["total_bids_received"] = -1
+        await record_supplier_preference(bid["supplier_id"], job, weight=-1)
+    await bump_counters(counter_changes)
+    await bump_versions("bids")
+    
     return {"message": "Bid deleted successfully"}
 
+# Cascading deletes
+# Users and jobs are removed on the request; their dependent data is cleared by a tracked background task
+UPLOAD_ROOT = "/app/backend/uploads"
+UPLOAD_UNLINK_BATCH = 20
+# What the cascade keeps about each job and bid it removes
+CASCADE_JOB_FIELDS = ["id", "posted_by", "status", "category", "location", "budget_range"]
+CASCADE_BID_FIELDS = ["id", "job_id", "supplier_id", "status"]
+
+def new_deletion(kind: str, target_id: str, jobs: List[Dict]) -> Dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "target_id": target_id,
+        # Jobs are recorded with the request and bids on the first run, so a resumed cascade
+        # still knows what to clean up after earlier steps have deleted the documents
+        "jobs": jobs,
+        "bids": None,
+        "status": "pending",
+        "steps_done": [],
+        "deleted": {},
+        "created_at": datetime.utcnow()
+    }
+
+async def remove_upload_dirs(paths: List[str]) -> int:
+    """Remove upload directories off the event loop, a batch at a time"""
+    loop = asyncio.get_running_loop()
+    removed = 0
+    for start in range(0, len(paths), UPLOAD_UNLINK_BATCH):
+        batch = [path for path in paths[start:start + UPLOAD_UNLINK_BATCH] if await aiofiles.os.path.isdir(path)]
+        await asyncio.gather(*(loop.run_in_executor(None, shutil.rmtree, path, True) for path in batch))
+        removed += len(batch)
+    return removed
+
+@task_queue.handler("cascade_delete")
+async def cascade_delete_task(deletion_id: str):
+    """Bulk-delete everything that belongs to a deleted user or job.
+    
+    Each finished step is recorded on the deletion document, so a retried task resumes
+    where it stopped instead of repeating counter updates.
+    """
+    deletion = await db.deletions.find_one({"id": deletion_id})
+    if deletion is None or deletion["status"] == "done":
+        return
+    target_id = deletion["target_id"]
+    steps_done = set(deletion["steps_done"])
+    await db.deletions.update_one({"id": deletion_id}, {"$set": {"status": "running", "started_at": datetime.utcnow()}})
+    
+    async def step(name: str, run):
+        if name in steps_done:
+            return
+        result = await run()
+        if hasattr(result, "deleted_count"):
+            result = result.deleted_count
+        update = {"$addToSet": {"steps_done": name}}
+        if isinstance(result, int):
+            update["$set"] = {f"deleted.{name}": result}
+        await db.deletions.update_one({"id": deletion_id}, update)
+    
+    try:
+        jobs = deletion["jobs"]
+        job_ids = [job["id"] for job in jobs]
+        bids = deletion["bids"]
+        if bids is None:
+            bid_filter = {"job_id": {"$in": job_ids}}
+            if deletion["kind"] == "user":
+                bid_filter = {"$or": [bid_filter, {"supplier_id": target_id}]}
+            bids = await db.bids.find(bid_filter, {"_id": 0, **{field: 1 for field in CASCADE_BID_FIELDS}}).to_list(None)
+            await db.deletions.update_one({"id": deletion_id}, {"$set": {"bids": bids}})
+        bid_ids = [bid["id"] for bid in bids]
+        
+        async def update_counters():
+            counter_changes: Dict[str, Dict[str, int]] = {GLOBAL_COUNTERS: {}}
+            
+            def change(counter_id: str, field: str, delta: int):
+                fields = counter_changes.setdefault(counter_id, {})
+                fields[field] = fields.get(field, 0) + delta
+            
+            for job in jobs:
+                open_job = 1 if job.get("status") == "open" else 0
+                for counter_id in [GLOBAL_COUNTERS, job["posted_by"]]:
+                    change(counter_id, "total_jobs", -1)
+                    change(counter_id, "active_jobs", -open_job)
+            
+            owners = {job["id"]: job["posted_by"] for job in jobs}
+            other_job_ids = list({bid["job_id"] for bid in bids} - set(owners))
+            async for job in db.jobs.find({"id": {"$in": other_job_ids}}, {"_id": 0, "id": 1, "posted_by": 1}):
+                owners[job["id"]] = job["posted_by"]
+            for bid in bids:
+                change(GLOBAL_COUNTERS, "total_bids", -1)
+                change(bid["supplier_id"], "total_bids", -1)
+                if bid.get("status") == "awarded":
+                    change(bid["supplier_id"], "won_bids", -1)
+                if bid["job_id"] in owners:
+                    change(owners[bid["job_id"]], "total_bids_received", -1)
+            await bump_counters(counter_changes)
+        
+        async def delete_chat_messages():
+            await forget_chat_rollups({"job_id": {"$in": job_ids}})
+            await db.chat_sequences.delete_many({"job_id": {"$in": job_ids}})
+            return (await db.chat_messages.delete_many({"job_id": {"$in": job_ids}})).deleted_count
+        
+        notification_filter = {"related_job_id": {"$in": job_ids}}
+        if deletion["kind"] == "user":
+            notification_filter = {"$or": [notification_filter, {"user_id": target_id}]}
+        
+        async def delete_notifications():
+            # Recorded before the delete, so a retry after it still knows whose unread counters to lower
+            unread = deletion.get("unread_notifications")
+            if unread is None:
+                unread = {
+                    row["_id"]: row["unread"] async for row in db.notifications.aggregate([
+                        {"$match": notification_filter},
+                        {"$group": {"_id": "$user_id", "unread": {"$sum": {"$cond": [{"$eq": ["$read", False]}, 1, 0]}}}}
+                    ])
+                }
+                await db.deletions.update_one({"id": deletion_id}, {"$set": {"unread_notifications": unread}})
+                deletion["unread_notifications"] = unread
+            result = await db.notifications.delete_many(notification_filter)
+            await bump_unread_counts({user_id: -count for user_id, count in unread.items() if count})
+            return result.deleted_count
+        
+        await step("counters", update_counters)
+        # The deleted user's own vector goes with their other records below
+        await step("preferences", lambda: forget_supplier_preferences(
+            [bid for bid in bids if bid["supplier_id"] != target_id], {job["id"]: job for job in jobs}
+        ))
+        await step("notifications", delete_notifications)
+        await step("chat_files", lambda: db.chat_files.delete_many({"job_id": {"$in": job_ids}}))
+        await step("chat_messages", delete_chat_messages)
+        await step("conversations", lambda: db.conversations.delete_many({"job_id": {"$in": job_ids}}))
+        await step("job_files", lambda: db.job_files.delete_many({"job_id": {"$in": job_ids}}))
+        await step("bid_files", lambda: db.bid_files.delete_many({"bid_id": {"$in": bid_ids}}))
+        await step("bids", lambda: db.bids.delete_many({"id": {"$in": bid_ids}}))
+        await step("jobs", lambda: db.jobs.delete_many({"id": {"$in": job_ids}}))
+        await step("upload_dirs", lambda: remove_upload_dirs(
+            [f"{UPLOAD_ROOT}/jobs/{job_id}" for job_id in job_ids]
+            + [f"{UPLOAD_ROOT}/chat/{job_id}" for job_id in job_ids]
+            + [f"{UPLOAD_ROOT}/bids/{bid_id}" for bid_id in bid_ids]
+        ))
+        
+        if deletion["kind"] == "user":
+            async def forget_user():
+                await db.dashboard_counters.delete_one({"id": target_id})
+                await db.supplier_preferences.delete_one({"id": target_id})
+                # Chats on other buyers' jobs lose the user as a participant
+                for job_id in await db.conversations.distinct("job_id", {"participant_ids": target_id}):
+                    await rebuild_conversation(job_id)
+            await step("user_records", forget_user)
+        
+        # Everyone who lost notifications, read or not, gets a fresh notifications ETag
+        await bump_versions(
+            "jobs", "bids", "conversations", *(f"chat:{job_id}" for job_id in job_ids),
+            *(f"notifications:{user_id}" for user_id in deletion.get("unread_notifications") or {})
+        )
+    except Exception as e:
+        await db.deletions.update_one({"id": deletion_id}, {"$set": {"status": "retrying", "error": str(e)}})
+        raise
+    
+    await db.deletions.update_one({"id": deletion_id}, {"$set": {"status": "done", "finished_at": datetime.utcnow()}})
+
+@api_router.get("/admin/deletions/{deletion_id}")
+async def get_deletion_status(deletion_id: str, current_user: User = Depends(require_admin)):
+    """Progress of a cascading delete - steps finished so far and documents removed per collection"""
+    deletion = await db.deletions.find_one({"id": deletion_id}, {"_id": 0})
+    if not deletion:
+        raise HTTPException(status_code=404, detail="Deletion not found")
+    return deletion
+
 # Payment endpoints - Updated for monthly billing
 @api_router.post("/payments/create-subscription-order")
 async def create_subscription_order(current_user: User = Depends(require_buyer)):
     try:
-        order = razorpay_client.order.create({
-            "amount": SUBSCRIPTION_AMOUNT,
-            "currency": "INR",
-            "payment_capture": 1
-        })
+        order = await payment_gateway.create_order(SUBSCRIPTION_AMOUNT, "INR")
         
         # Store order in database
         await db.payment_orders.insert_one({
@@ -693,11 +1976,7 @@ async def verify_subscription_payment(
 ):
     try:
         # Verify payment signature
-        razorpay_client.utility.verify_payment_signature({
-            'razorpay_order_id': order_id,
-            'razorpay_payment_id': payment_id,
-            'razorpay_signature': signature
-        })
+        await payment_gateway.verify_payment_signature(order_id, payment_id, signature)
         
         # Update user subscription - monthly billing
         expires_at = datetime.utcnow() + timedelta(days=30)  # 1 month subscription
@@ -711,6 +1990,7 @@ async def verify_subscription_payment(
                 }
             }
         )
+        user_cache.invalidate(current_user.id)
         
         # Update payment order status
         await db.payment_orders.update_one(
@@ -728,17 +2008,272 @@ async def verify_subscription_payment(
 async def create_job(job_data: JobPostCreate, current_user: User = Depends(require_active_subscription_or_trial)):
     job = JobPost(**job_data.dict(), posted_by=current_user.id)
     await db.jobs.insert_one(job.dict())
+    await bump_counters({
+        GLOBAL_COUNTERS: {"total_jobs": 1, "active_jobs": 1},
+        current_user.id: {"total_jobs": 1, "active_jobs": 1}
+    })
+    await bump_job_facets([job.dict()], 1)
+    await bump_versions("jobs")
     return job
 
-@api_router.get("/jobs", response_model=List[JobPost])
-async def get_jobs(current_user: User = Depends(get_current_user)):
-    jobs = await db.jobs.find({"status": "open"}).sort("created_at", -1).to_list(100)
-    return [JobPost(**job) for job in jobs]
+@api_router.get("/jobs", response_model=List[Dict])
+async def get_jobs(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    jobs = await fetch_page(db.jobs, {"status": "open"}, cursor, limit, response, field_projection(fields, JOB_FIELDS))
+    return fast_json(jobs, response)
+
+@api_router.get("/jobs/my", response_model=List[Dict])
+async def get_my_jobs(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user: User = Depends(require_buyer)
+):
+    jobs = await fetch_page(db.jobs, {"posted_by": current_user.id}, cursor, limit, response, field_projection(fields, JOB_FIELDS))
+    return fast_json(jobs, response)
+
+JOB_SEARCH_FACET_SIZE = 50
+
+class SearchFacetCache:
+    """Per-process LRU of keyword search totals and facet counts, keyed by the search.
+    
+    Entries are not invalidated by job writes - they expire after `ttl_seconds`, which bounds how stale
+    a count can be. Concurrent misses for the same key share one aggregation.
+    """
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+    
+    async def get(self, key: tuple, compute):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            entry = (time.monotonic() + self.ttl_seconds, asyncio.ensure_future(compute()))
+            self.entries[key] = entry
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(key)
+        try:
+            # Shielded so one cancelled request doesn't cancel the aggregation for everyone waiting on it
+            return await asyncio.shield(entry[1])
+        except Exception:
+            if self.entries.get(key) is entry:
+                del self.entries[key]
+            raise
+
+search_facet_cache = SearchFacetCache(
+    max_size=int(os.environ.get('JOB_SEARCH_FACET_CACHE_SIZE', 1000)),
+    ttl_seconds=float(os.environ.get('JOB_SEARCH_FACET_TTL_SECONDS', 60))
+)
+
+async def open_job_facets(filters: Dict) -> Dict:
+    """Total and per-category/per-location counts of open jobs matching exact filters, from job_facet_counts"""
+    rows = await db.job_facet_counts.find({**filters, "open": {"$gt": 0}}, {"_id": 0}).to_list(None)
+    
+    def facet_counts(field: str) -> List[Dict]:
+        counts: Dict[str, int] = {}
+        for row in rows:
+            counts[row.get(field)] = counts.get(row.get(field), 0) + row["open"]
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0] or ""))
+        return [{"value": value, "count": count} for value, count in ranked[:JOB_SEARCH_FACET_SIZE]]
+    
+    return {
+        "total": sum(row["open"] for row in rows),
+        "category": facet_counts("category"),
+        "location": facet_counts("location")
+    }
+
+async def job_search_facets(match: Dict) -> Dict:
+    """Total and per-category/per-location counts of the jobs matching a keyword search"""
+    facet_counts = lambda field: [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": JOB_SEARCH_FACET_SIZE},
+        {"$project": {"_id": 0, "value": "$_id", "count": 1}}
+    ]
+    result = await db.jobs.aggregate([
+        {"$match": match},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "category": facet_counts("category"),
+            "location": facet_counts("location")
+        }}
+    ]).to_list(1)
+    facets = result[0]
+    return {
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "category": facets["category"],
+        "location": facets["location"]
+    }
+
+@api_router.get("/jobs/search")
+async def search_jobs(
+    q: Optional[str] = Query(None, max_length=200),
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    budget_range: Optional[str] = None,
+    offset: int = Query(0, ge=0, le=10000),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user)
+):
+    """Search open jobs by keywords in title/description and exact category, location and budget filters.
+    
+    Only the requested page is queried per request, through the text or compound status indexes. The
+    total and per-category/per-location counts come from the incrementally kept job_facet_counts, or for
+    keyword searches from search_facet_cache. Keyword searches are ordered by relevance, otherwise newest first.
+    """
+    keywords = q.strip() if q else ""
+    match: Dict = {"status": "open"}
+    projection: Dict = {"_id": 0}
+    if keywords:
+        match["$text"] = {"$search": keywords}
+        projection["score"] = {"$meta": "textScore"}
+        sort = [("score", {"$meta": "textScore"}), ("created_at", -1), ("id", -1)]
+    else:
+        sort = [("created_at", -1), ("id", -1)]
+    filters = {field: value for field, value in zip(JOB_FACET_FIELDS, [category, location, budget_range]) if value}
+    match.update(filters)
+    
+    if keywords:
+        facets = search_facet_cache.get((keywords, category, location, budget_range), lambda: job_search_facets(match))
+    else:
+        facets = open_job_facets(filters)
+    jobs, facets = await asyncio.gather(
+        db.jobs.find(match, projection).sort(sort).skip(offset).limit(limit).to_list(limit),
+        facets
+    )
+    
+    return {
+        "results": [JobPost(**job) for job in jobs],
+        "total": facets["total"],
+        "facets": {"category": facets["category"], "location": facets["location"]},
+        "offset": offset,
+        "limit": limit
+    }
+
+# Supplier job feed
+# Each supplier's bid history is folded into category and location weights as they bid, and open jobs are ranked against them
+FEED_CANDIDATES = int(os.environ.get('FEED_CANDIDATES', 500))
+FEED_TOP_PREFERENCES = 10
+FEED_RECENCY_HALF_LIFE_DAYS = 7.0
+FEED_WEIGHTS = np.array([0.55, 0.3, 0.15])  # category, location, recency
+# Incremental updates can drift (a bid racing the first rebuild) - rebuild from bid history this often
+FEED_PREFERENCES_MAX_AGE = timedelta(days=float(os.environ.get('FEED_PREFERENCES_MAX_AGE_DAYS', 7)))
 
-@api_router.get("/jobs/my", response_model=List[JobPost])
-async def get_my_jobs(current_user: User = Depends(require_buyer)):
-    jobs = await db.jobs.find({"posted_by": current_user.id}).sort("created_at", -1).to_list(100)
-    return [JobPost(**job) for job in jobs]
+def _preference_key(value: str) -> str:
+    # Field names can't contain "." or start with "$"
+    return value.replace(".", "\uff0e").replace("$", "\uff04")
+
+def _preference_value(key: str) -> str:
+    return key.replace("\uff0e", ".").replace("\uff04", "$")
+
+def _preference_update(job: Dict, weight: int) -> Dict:
+    return {
+        "$inc": {
+            f"categories.{_preference_key(job['category'])}": weight,
+            f"locations.{_preference_key(job['location'])}": weight,
+            "bid_count": weight
+        },
+        "$set": {"updated_at": datetime.utcnow()}
+    }
+
+async def record_supplier_preference(supplier_id: str, job: Dict, weight: int = 1):
+    """Fold one bid on a job into the supplier's preference vector.
+    
+    Only updates an existing vector - a supplier without one gets it built from their whole
+    bid history on their first feed request, not from this one bid.
+    """
+    await db.supplier_preferences.update_one({"id": supplier_id}, _preference_update(job, weight))
+
+async def forget_supplier_preferences(bids: List[Dict], jobs: Dict[str, Dict]):
+    """Take deleted bids back out of their suppliers' preference vectors"""
+    operations = [
+        UpdateOne({"id": bid["supplier_id"]}, _preference_update(jobs[bid["job_id"]], -1))
+        for bid in bids
+        if bid["job_id"] in jobs and "category" in jobs[bid["job_id"]]
+    ]
+    if operations:
+        await db.supplier_preferences.bulk_write(operations, ordered=False)
+
+async def rebuild_supplier_preferences(supplier_id: str) -> Dict:
+    """Recompute a supplier's preference vector from their whole bid history"""
+    categories: Dict[str, int] = {}
+    locations: Dict[str, int] = {}
+    async for entry in db.bids.aggregate([
+        {"$match": {"supplier_id": supplier_id}},
+        {"$lookup": {"from": "jobs", "localField": "job_id", "foreignField": "id", "as": "job"}},
+        {"$unwind": "$job"},
+        {"$group": {"_id": {"category": "$job.category", "location": "$job.location"}, "count": {"$sum": 1}}}
+    ]):
+        category = _preference_key(entry["_id"]["category"])
+        location = _preference_key(entry["_id"]["location"])
+        categories[category] = categories.get(category, 0) + entry["count"]
+        locations[location] = locations.get(location, 0) + entry["count"]
+    
+    preferences = {
+        "id": supplier_id,
+        "categories": categories,
+        "locations": locations,
+        "bid_count": sum(categories.values()),
+        "updated_at": datetime.utcnow(),
+        "rebuilt_at": datetime.utcnow()
+    }
+    await db.supplier_preferences.replace_one({"id": supplier_id}, preferences, upsert=True)
+    return preferences
+
+def _normalized_weights(weights: Dict[str, int]) -> Dict[str, float]:
+    total = sum(max(weight, 0) for weight in weights.values())
+    return {_preference_value(key): max(weight, 0) / total for key, weight in weights.items()} if total else {}
+
+def score_jobs(jobs: List[Dict], categories: Dict[str, float], locations: Dict[str, float], now: datetime) -> np.ndarray:
+    """Relevance of each job - weighted category share, location share and recency decay"""
+    features = np.array([
+        [categories.get(job["category"], 0.0), locations.get(job["location"], 0.0), (now - job["created_at"]).total_seconds()]
+        for job in jobs
+    ], dtype=float).reshape(-1, 3)
+    features[:, 2] = np.exp2(-features[:, 2] / (FEED_RECENCY_HALF_LIFE_DAYS * 86400))
+    return features @ FEED_WEIGHTS
+
+@api_router.get("/jobs/feed")
+async def get_job_feed(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_supplier)
+):
+    """Open jobs the supplier hasn't bid on, ranked by how well they match the supplier's bidding history"""
+    preferences = await db.supplier_preferences.find_one({"id": current_user.id})
+    if preferences is None or preferences.get("rebuilt_at", datetime.min) < datetime.utcnow() - FEED_PREFERENCES_MAX_AGE:
+        preferences = await rebuild_supplier_preferences(current_user.id)
+    categories = _normalized_weights(preferences.get("categories", {}))
+    locations = _normalized_weights(preferences.get("locations", {}))
+    
+    projection = {"_id": 0}
+    already_bid = set(await db.bids.distinct("job_id", {"supplier_id": current_user.id}))
+    
+    # Candidates: the newest open jobs in the supplier's top categories and locations, plus the newest overall
+    top = lambda weights: sorted(weights, key=weights.get, reverse=True)[:FEED_TOP_PREFERENCES]
+    candidates: Dict[str, Dict] = {}
+    if categories or locations:
+        preferred = await db.jobs.find(
+            {"status": "open", "$or": [{"category": {"$in": top(categories)}}, {"location": {"$in": top(locations)}}]},
+            projection
+        ).sort([("created_at", -1), ("id", -1)]).to_list(FEED_CANDIDATES)
+        candidates.update((job["id"], job) for job in preferred)
+    newest = await db.jobs.find({"status": "open"}, projection).sort([("created_at", -1), ("id", -1)]).to_list(limit * 5)
+    candidates.update((job["id"], job) for job in newest)
+    
+    jobs = [job for job_id, job in candidates.items() if job_id not in already_bid]
+    if not jobs:
+        return []
+    
+    scores = score_jobs(jobs, categories, locations, datetime.utcnow())
+    ranked = np.argsort(-scores, kind="stable")[:limit]
+    return [{**JobPost(**jobs[i]).dict(), "relevance": round(float(scores[i]), 4)} for i in ranked]
 
 # Bidding endpoints
 @api_router.post("/jobs/{job_id}/bids")
@@ -755,6 +2290,13 @@ async def submit_bid(job_id: str, bid_data: BidCreate, current_user: User = Depe
     
     bid = Bid(**bid_data.dict(), job_id=job_id, supplier_id=current_user.id)
     await db.bids.insert_one(bid.dict())
+    await record_supplier_preference(current_user.id, job)
+    await bump_counters({
+        GLOBAL_COUNTERS: {"total_bids": 1},
+        current_user.id: {"total_bids": 1},
+        job["posted_by"]: {"total_bids_received": 1}
+    })
+    await bump_versions("bids")
     return bid
 
 # Salesman bidding endpoint for unregistered companies
@@ -808,26 +2350,44 @@ async def submit_salesman_bid(job_id: str, bid_data: SalesmanBidCreate, current_
     }
     
     await db.bids.insert_one(bid_document)
+    await bump_counters({
+        GLOBAL_COUNTERS: {"total_bids": 1},
+        current_user.id: {"total_bids": 1},
+        job["posted_by"]: {"total_bids_received": 1}
+    })
+    await bump_versions("bids")
     return salesman_bid
 
 @api_router.get("/jobs/{job_id}/bids", response_model=List[Dict])
-async def get_job_bids(job_id: str, current_user: User = Depends(get_current_user)):
+async def get_job_bids(
+    job_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
+):
     # Check if user owns the job or is admin
-    job = await db.jobs.find_one({"id": job_id})
+    job = await db.jobs.find_one({"id": job_id}, {"_id": 0, "posted_by": 1})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     if job["posted_by"] != current_user.id and current_user.role not in [UserRole.ADMIN, UserRole.SALESMAN]:
         raise HTTPException(status_code=403, detail="Not authorized to view bids")
     
-    bids = await db.bids.find({"job_id": job_id}).sort("created_at", -1).to_list(100)
+    projection = field_projection(fields, BID_FIELDS + ["supplier_info"])
+    with_supplier = projection.pop("supplier_info", None)
+    if with_supplier:
+        projection.update(supplier_id=1, bid_type=1, company_details=1)
+    bids = await fetch_page(db.bids, {"job_id": job_id}, cursor, limit, response, projection)
+    if not with_supplier:
+        return fast_json(bids, response)
+    suppliers = await loaders.users.load_many([bid["supplier_id"] for bid in bids])
     
-    # Enrich with supplier info and convert ObjectIds
+    # Enrich with supplier info
     enriched_bids = []
-    for bid in bids:
-        # Remove MongoDB ObjectId if present
-        bid_dict = {k: v for k, v in bid.items() if k != '_id'}
-        
+    for bid_dict, supplier in zip(bids, suppliers):
         # Check if this is a salesman bid
         if bid_dict.get("bid_type") == "salesman_bid" and "company_details" in bid_dict:
             # Use company details from salesman bid
@@ -845,7 +2405,6 @@ async def get_job_bids(job_id: str, current_user: User = Depends(get_current_use
             }
         else:
             # Regular supplier bid
-            supplier = await db.users.find_one({"id": bid_dict["supplier_id"]})
             bid_with_supplier = {
                 **bid_dict,
                 "supplier_info": {
@@ -856,24 +2415,26 @@ async def get_job_bids(job_id: str, current_user: User = Depends(get_current_use
         
         enriched_bids.append(bid_with_supplier)
     
-    return enriched_bids
+    return fast_json(enriched_bids, response)
 
 @api_router.get("/bids/my", response_model=List[Dict])
-async def get_my_bids(current_user: User = Depends(get_current_user)):
+async def get_my_bids(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
+):
     # Allow suppliers and salesmen to view their bids
     if current_user.role not in [UserRole.SUPPLIER, UserRole.SALESMAN]:
         raise HTTPException(status_code=403, detail="Only suppliers and salesmen can view their bids")
     
-    bids = await db.bids.find({"supplier_id": current_user.id}).sort("created_at", -1).to_list(100)
+    bids = await fetch_page(db.bids, {"supplier_id": current_user.id}, cursor, limit, response, {"_id": 0})
+    jobs = await loaders.jobs.load_many([bid["job_id"] for bid in bids])
     
-    # Enrich with job info and convert ObjectIds
+    # Enrich with job info
     enriched_bids = []
-    for bid in bids:
-        # Remove MongoDB ObjectId if present
-        bid_dict = {k: v for k, v in bid.items() if k != '_id'}
-        
-        job = await db.jobs.find_one({"id": bid_dict["job_id"]})
-        
+    for bid_dict, job in zip(bids, jobs):
         # Handle salesman bids with company details
         if bid_dict.get("bid_type") == "salesman_bid" and "company_details" in bid_dict:
             company_details = bid_dict["company_details"]
@@ -905,7 +2466,7 @@ async def get_my_bids(current_user: User = Depends(get_current_user)):
         
         enriched_bids.append(bid_with_job)
     
-    return enriched_bids
+    return fast_json(enriched_bids, response)
 
 class Notification(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -931,11 +2492,12 @@ async def award_bid(job_id: str, bid_id: str, current_user: User = Depends(requi
     if not bid:
         raise HTTPException(status_code=404, detail="Bid not found")
     
-    # Award the bid
-    await db.bids.update_one({"id": bid_id}, {"$set": {"status": "awarded"}})
-    await db.jobs.update_one({"id": job_id}, {"$set": {"status": "awarded"}})
+    other_bids = await db.bids.find(
+        {"job_id": job_id, "id": {"$ne": bid_id}},
+        {"_id": 0, "id": 1, "supplier_id": 1, "status": 1}
+    ).to_list(None)
     
-    # Create notification for awarded supplier
+    # Notify the awarded supplier and every rejected supplier
     winning_notification = Notification(
         user_id=bid["supplier_id"],
         title="🎉 Congratulations! Your bid was awarded",
@@ -944,15 +2506,8 @@ async def award_bid(job_id: str, bid_id: str, current_user: User = Depends(requi
         related_job_id=job_id,
         related_bid_id=bid_id
     )
-    await db.notifications.insert_one(winning_notification.dict())
-    
-    # Reject other bids and notify suppliers
-    other_bids = await db.bids.find({"job_id": job_id, "id": {"$ne": bid_id}}).to_list(100)
-    for other_bid in other_bids:
-        await db.bids.update_one({"id": other_bid["id"]}, {"$set": {"status": "rejected"}})
-        
-        # Create notification for rejected suppliers
-        rejection_notification = Notification(
+    rejection_notifications = [
+        Notification(
             user_id=other_bid["supplier_id"],
             title="Bid Update",
             message=f"Your bid for '{job['title']}' was not selected this time. Keep bidding on other projects!",
@@ -960,15 +2515,130 @@ async def award_bid(job_id: str, bid_id: str, current_user: User = Depends(requi
             related_job_id=job_id,
             related_bid_id=other_bid["id"]
         )
-        await db.notifications.insert_one(rejection_notification.dict())
+        for other_bid in other_bids
+    ]
+    notifications = [winning_notification, *rejection_notifications]
+    
+    counter_changes: Dict[str, Dict[str, int]] = {}
+    if job["status"] == "open":
+        counter_changes[GLOBAL_COUNTERS] = {"active_jobs": -1}
+        counter_changes[current_user.id] = {"active_jobs": -1}
+    if bid["status"] != "awarded":
+        counter_changes.setdefault(bid["supplier_id"], {})["won_bids"] = 1
+    for other_bid in other_bids:
+        if other_bid.get("status") == "awarded":
+            # Re-award - the previous winner loses the win
+            won = counter_changes.setdefault(other_bid["supplier_id"], {})
+            won["won_bids"] = won.get("won_bids", 0) - 1
+    
+    # Award, reject and notify atomically so a failure can't leave the job half-awarded
+    async def apply_award(session):
+        await db.bids.update_one({"id": bid_id}, {"$set": {"status": "awarded"}}, session=session)
+        await db.jobs.update_one({"id": job_id}, {"$set": {"status": "awarded"}}, session=session)
+        if job["status"] == "open":
+            await bump_job_facets([job], -1, session=session)
+        await set_conversation_job_status([job_id], "awarded", session=session)
+        await db.bids.update_many(
+            {"job_id": job_id, "id": {"$ne": bid_id}},
+            {"$set": {"status": "rejected"}},
+            session=session
+        )
+        await bump_counters(counter_changes, session=session)
+        # Queued in the same transaction, so the notifications go out if and only if the award commits
+        await task_queue.enqueue(
+            "create_notifications",
+            {"notifications": [notification.dict() for notification in notifications]},
+            session=session
+        )
+    
+    await run_in_transaction(apply_award)
+    task_queue.wake()
+    await bump_versions("jobs", "bids")
+    await rebuild_conversation(job_id)
+    
+    # Both parties' chat lists gain the new conversation
+    await event_bus.publish([current_user.id, bid["supplier_id"]], "job_awarded", {"job_id": job_id, "bid_id": bid_id})
     
     return {"message": "Bid awarded successfully", "notifications_sent": len(other_bids) + 1}
 
 # Notification endpoints
+class UnreadCountCache:
+    """Per-process cache of unread notification counts.
+    
+    Writes in this process invalidate their users; the TTL bounds staleness from other workers.
+    """
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.entries: Dict[str, tuple] = {}
+    
+    def get(self, user_id: str) -> Optional[int]:
+        entry = self.entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def set(self, user_id: str, count: int):
+        self.entries[user_id] = (time.monotonic() + self.ttl_seconds, count)
+    
+    def invalidate(self, *user_ids: str):
+        for user_id in user_ids:
+            self.entries.pop(user_id, None)
+    
+    def clear(self):
+        self.entries.clear()
+
+unread_count_cache = UnreadCountCache(ttl_seconds=float(os.environ.get('UNREAD_COUNT_CACHE_TTL_SECONDS', 30)))
+
+async def bump_unread_counts(increments: Dict[str, int]):
+    """Apply {user_id: delta} to the unread notification counters"""
+    await bump_counters({user_id: {"unread_notifications": delta} for user_id, delta in increments.items()})
+    unread_count_cache.invalidate(*increments)
+    await bump_versions(*(f"notifications:{user_id}" for user_id in increments))
+
+async def recount_unread_notifications(user_ids: List[str]):
+    """Set users' unread counters from their notifications (a racing $inc is left to reconciliation)"""
+    for user_id in user_ids:
+        unread = await db.notifications.count_documents({"user_id": user_id, "read": False})
+        await db.dashboard_counters.update_one({"id": user_id}, {"$set": {"unread_notifications": unread}}, upsert=True)
+
+@task_queue.handler("create_notifications")
+async def create_notifications_task(notifications: List[Dict]):
+    """Store notifications, count them as unread and push them to their recipients"""
+    async def store(session):
+        # Skip the ones a previous attempt stored; a duplicate-key error would abort a transaction
+        existing = set(await db.notifications.distinct(
+            "id", {"id": {"$in": [notification["id"] for notification in notifications]}}, session=session
+        ))
+        new = [notification for notification in notifications if notification["id"] not in existing]
+        increments: Dict[str, int] = {}
+        for notification in new:
+            increments[notification["user_id"]] = increments.get(notification["user_id"], 0) + 1
+        if new:
+            await db.notifications.insert_many(new, ordered=False, session=session)
+            await bump_counters({user_id: {"unread_notifications": delta} for user_id, delta in increments.items()}, session=session)
+        return new, existing
+    
+    inserted, existing = await run_in_transaction(store)
+    affected = {notification["user_id"] for notification in notifications}
+    if existing and not await supports_transactions():
+        # A retry without transactions - the earlier attempt may have stored notifications but not counted them
+        await recount_unread_notifications(list(affected))
+    unread_count_cache.invalidate(*affected)
+    await bump_versions(*(f"notifications:{user_id}" for user_id in affected))
+    
+    for notification in inserted:
+        notification.pop("_id", None)
+        await event_bus.publish([notification["user_id"]], "notification", notification)
+
 @api_router.get("/notifications")
-async def get_notifications(current_user: User = Depends(get_current_user)):
-    notifications = await db.notifications.find({"user_id": current_user.id}).sort("created_at", -1).to_list(50)
-    return [Notification(**notification) for notification in notifications]
+async def get_notifications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user)
+):
+    notifications = await fetch_page(db.notifications, {"user_id": current_user.id}, cursor, limit, response, {"_id": 0})
+    return fast_json(notifications, response)
 
 @api_router.post("/notifications/{notification_id}/read")
 async def mark_notification_read(notification_id: str, current_user: User = Depends(get_current_user)):
@@ -979,17 +2649,32 @@ async def mark_notification_read(notification_id: str, current_user: User = Depe
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Notification not found")
     
+    await bump_unread_counts({current_user.id: -1})
     return {"message": "Notification marked as read"}
 
 @api_router.get("/notifications/unread-count")
-async def get_unread_notifications_count(current_user: User = Depends(get_current_user)):
-    count = await db.notifications.count_documents({"user_id": current_user.id, "read": False})
+async def get_unread_notifications_count(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+):
+    count = unread_count_cache.get(current_user.id)
+    if count is None:
+        counters = await db.dashboard_counters.find_one({"id": current_user.id}, {"_id": 0, "unread_notifications": 1}) or {}
+        count = max(counters.get("unread_notifications", 0), 0)
+        unread_count_cache.set(current_user.id, count)
+    
+    # Pollers that send back the ETag get an empty 304 until the count changes
+    etag = f'"unread-{count}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     return {"unread_count": count}
 
 # Chat endpoints
-@api_router.get("/jobs/{job_id}/chat")
-async def get_job_chat(job_id: str, current_user: User = Depends(get_current_user)):
-    # Check if user is involved in this job (either buyer, awarded supplier, or admin)
+async def get_chat_job_for_user(job_id: str, current_user: User):
+    """Return the job if the user may read its chat (buyer, awarded supplier or admin)"""
     job = await db.jobs.find_one({"id": job_id})
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -1012,16 +2697,26 @@ async def get_job_chat(job_id: str, current_user: User = Depends(get_current_use
     if not is_authorized:
         raise HTTPException(status_code=403, detail="Not authorized to access this chat")
     
-    # Get chat messages
-    messages = await db.chat_messages.find({"job_id": job_id}).sort("created_at", 1).to_list(1000)
+    return job
+
+async def enrich_chat_messages(messages: List[Dict]) -> List[Dict]:
+    """Attach sender company name and role to each chat message"""
+    # A chat only has a handful of distinct senders - resolve them all in one query
+    sender_ids = list({message["sender_id"] for message in messages})
+    senders = {}
+    if sender_ids:
+        async for sender in db.users.find(
+            {"id": {"$in": sender_ids}},
+            {"_id": 0, "id": 1, "company_name": 1, "role": 1}
+        ):
+            senders[sender["id"]] = sender
     
-    # Enrich with sender info
     enriched_messages = []
     for message in messages:
         # Remove MongoDB ObjectId if present
         message_dict = {k: v for k, v in message.items() if k != '_id'}
         
-        sender = await db.users.find_one({"id": message["sender_id"]})
+        sender = senders.get(message["sender_id"])
         message_with_sender = {
             **message_dict,
             "sender_info": {
@@ -1033,6 +2728,196 @@ async def get_job_chat(job_id: str, current_user: User = Depends(get_current_use
     
     return enriched_messages
 
+# Conversation summaries - one document per job chat, kept current on every send and read
+async def rebuild_conversation(job_id: str):
+    """Recompute a job's conversation summary from its messages and awarded bid"""
+    job = await db.jobs.find_one({"id": job_id})
+    awarded_bid = await db.bids.find_one({"job_id": job_id, "status": "awarded"})
+    message_count = await db.chat_messages.count_documents({"job_id": job_id})
+    if not job or (message_count == 0 and not awarded_bid):
+        await db.conversations.delete_one({"job_id": job_id})
+        await bump_versions("conversations", f"chat:{job_id}")
+        return
+    
+    last_message = await db.chat_messages.find_one({"job_id": job_id}, sort=[("created_at", -1), ("id", -1)])
+    unread = await db.chat_messages.aggregate([
+        {"$match": {"job_id": job_id, "read": False}},
+        {"$group": {"_id": "$receiver_id", "count": {"$sum": 1}}}
+    ]).to_list(None)
+    message_users = await db.chat_messages.aggregate([
+        {"$match": {"job_id": job_id}},
+        {"$group": {"_id": None, "senders": {"$addToSet": "$sender_id"}, "receivers": {"$addToSet": "$receiver_id"}}}
+    ]).to_list(None)
+    
+    buyer_id = job["posted_by"]
+    supplier_id = awarded_bid["supplier_id"] if awarded_bid else None
+    participant_ids = {buyer_id}
+    if supplier_id:
+        participant_ids.add(supplier_id)
+    if message_users:
+        participant_ids.update(message_users[0]["senders"] + message_users[0]["receivers"])
+    
+    participants = {}
+    async for user in db.users.find({"id": {"$in": list(participant_ids)}}, {"_id": 0, "id": 1, "company_name": 1, "role": 1}):
+        participants[user["id"]] = user
+    
+    await db.conversations.replace_one({"job_id": job_id}, {
+        "job_id": job_id,
+        "job_title": job["title"],
+        "job_status": job.get("status", "unknown"),
+        "buyer_id": buyer_id,
+        "supplier_id": supplier_id,
+        "participant_ids": list(participant_ids),
+        "participants": participants,
+        "message_count": message_count,
+        "unread_counts": {entry["_id"]: entry["count"] for entry in unread},
+        "last_message": last_message["message"] if last_message else None,
+        "last_sender": last_message["sender_id"] if last_message else None,
+        "last_message_at": last_message["created_at"] if last_message else None,
+        # Chat lists sort and page on this - an award with no messages yet sorts by when the job was posted
+        "last_activity_at": last_message["created_at"] if last_message else job.get("created_at", datetime.utcnow()),
+        "updated_at": datetime.utcnow()
+    }, upsert=True)
+    # Only after the write - a poll between a bump and its write would tag the old body as current
+    await bump_versions("conversations", f"chat:{job_id}")
+
+async def rebuild_all_conversations():
+    """Backfill conversation summaries for every job with messages or an awarded bid"""
+    job_ids = set()
+    async for entry in db.chat_messages.aggregate([{"$group": {"_id": "$job_id"}}]):
+        job_ids.add(entry["_id"])
+    async for bid in db.bids.find({"status": "awarded"}, {"job_id": 1}):
+        job_ids.add(bid["job_id"])
+    for job_id in job_ids:
+        await rebuild_conversation(job_id)
+    return len(job_ids)
+
+async def backfill_conversations():
+    """Startup backfill of conversation summaries, run by whichever worker takes the lease"""
+    if not await acquire_lease("conversation_backfill", CONVERSATION_BACKFILL_LEASE_SECONDS):
+        return
+    try:
+        count = await rebuild_all_conversations()
+        logger.info(f"Backfilled {count} conversation summaries")
+    except Exception as e:
+        # Let a restart retry it - the lease lapses on its own
+        logger.error(f"Conversation backfill failed: {e}")
+        return
+    await release_lease("conversation_backfill")
+
+async def set_conversation_job_status(job_ids: List[str], job_status: str, session=None):
+    """Copy a job status change into the affected conversation summaries"""
+    await db.conversations.update_many({"job_id": {"$in": job_ids}}, {"$set": {"job_status": job_status}}, session=session)
+
+# How many sequence numbers chat sync re-reads before the cursor when inserts are not transactional
+CHAT_SYNC_LOOKBACK = int(os.environ.get('CHAT_SYNC_LOOKBACK', 20))
+
+async def insert_chat_message(chat_msg: ChatMessage):
+    """Store a message under the job's next sequence number.
+    
+    The number is claimed in the same transaction as the insert, so a concurrent send
+    conflicts on the sequence document and commits after this one - a syncing reader
+    never sees message N + 1 before N.
+    """
+    async def store(session):
+        sequence = await db.chat_sequences.find_one_and_update(
+            {"job_id": chat_msg.job_id}, {"$inc": {"seq": 1}},
+            upsert=True, return_document=ReturnDocument.AFTER, session=session
+        )
+        chat_msg.seq = sequence["seq"]
+        await db.chat_messages.insert_one(chat_msg.dict(), session=session)
+    
+    await run_in_transaction(store)
+
+async def record_conversation_message(job: Dict, chat_msg: ChatMessage):
+    """Fold a newly sent message into the job's conversation summary"""
+    result = await db.conversations.update_one(
+        {"job_id": job["id"]},
+        {
+            "$set": {
+                "last_message": chat_msg.message,
+                "last_sender": chat_msg.sender_id,
+                "last_message_at": chat_msg.created_at,
+                "last_activity_at": chat_msg.created_at,
+                "updated_at": datetime.utcnow()
+            },
+            "$inc": {"message_count": 1, f"unread_counts.{chat_msg.receiver_id}": 1},
+            "$addToSet": {"participant_ids": {"$each": [chat_msg.sender_id, chat_msg.receiver_id]}}
+        },
+        upsert=True
+    )
+    if result.upserted_id is not None:
+        # First message in a chat that predates the summaries - fill in job and participant details
+        await rebuild_conversation(job["id"])
+    else:
+        await bump_versions("conversations", f"chat:{job['id']}")
+
+@api_router.get("/jobs/{job_id}/chat")
+async def get_job_chat(job_id: str, current_user: User = Depends(get_current_user)):
+    await get_chat_job_for_user(job_id, current_user)
+    
+    # Get chat messages
+    messages = await db.chat_messages.find({"job_id": job_id}, {"_id": 0}).sort("created_at", 1).to_list(1000)
+    
+    return fast_json(await enrich_chat_messages(messages))
+
+@api_router.get("/jobs/{job_id}/chat/sync")
+async def sync_job_chat(
+    job_id: str,
+    since: Optional[str] = None,
+    deleted_since: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Incremental chat sync - returns only messages after the `since` cursor.
+    
+    Without a cursor the full history is returned. Every response carries the cursor
+    to pass on the next call, so polling clients only read what is new. Messages
+    deleted after `deleted_since` are listed in `deleted_ids` so clients can drop them.
+    The cursor is the job's message sequence number, which the server assigns on insert.
+    Without transactions a message can commit after a later-numbered one, so the last
+    CHAT_SYNC_LOOKBACK numbers are read again; clients drop the ones they already have.
+    """
+    await get_chat_job_for_user(job_id, current_user)
+    # Taken before reading messages, so a delete that races this read is still reported next time
+    synced_at = datetime.utcnow()
+    
+    query = {"job_id": job_id}
+    last_seq = 0
+    if since:
+        try:
+            last_seq = int(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        lookback = 0 if await supports_transactions() else CHAT_SYNC_LOOKBACK
+        query["seq"] = {"$gt": last_seq - lookback}
+    
+    # Messages from before sequence numbers sort first on a full sync
+    messages = await db.chat_messages.find(query).sort([("seq", 1), ("created_at", 1), ("id", 1)]).to_list(1000)
+    cursor = str(max([last_seq] + [message.get("seq") or 0 for message in messages]))
+    
+    # Without a deletion cursor the client has nothing to drop yet - start it from now
+    deleted_ids = []
+    deleted_cursor = deleted_since or encode_cursor(synced_at, "")
+    if deleted_since:
+        deleted_at, message_id = decode_cursor(deleted_since)
+        tombstones = await db.chat_tombstones.find({
+            "job_id": job_id,
+            "$or": [
+                {"deleted_at": {"$gt": deleted_at}},
+                {"deleted_at": deleted_at, "id": {"$gt": message_id}}
+            ]
+        }, {"_id": 0, "id": 1, "deleted_at": 1}).sort([("deleted_at", 1), ("id", 1)]).to_list(1000)
+        if tombstones:
+            deleted_ids = [tombstone["id"] for tombstone in tombstones]
+            deleted_cursor = encode_cursor(tombstones[-1]["deleted_at"], tombstones[-1]["id"])
+    
+    return {
+        "messages": await enrich_chat_messages(messages),
+        "cursor": cursor,
+        "deleted_ids": deleted_ids,
+        "deleted_cursor": deleted_cursor
+    }
+
 @api_router.post("/upload/chat/{job_id}")
 async def upload_chat_files(
     job_id: str,
@@ -1067,33 +2952,21 @@ async def upload_chat_files(
     os.makedirs(upload_dir, exist_ok=True)
     
     for file in files:
-        # Validate file size (max 10MB)
-        contents = await file.read()
-        if len(contents) > 10 * 1024 * 1024:  # 10MB
-            raise HTTPException(status_code=413, detail=f"File {file.filename} is too large (max 10MB)")
-        
         # Validate file type - Only PDF and JPG allowed
         allowed_extensions = {'.pdf', '.jpg', '.jpeg'}
         file_extension = Path(file.filename).suffix.lower()
         if file_extension not in allowed_extensions:
             raise HTTPException(status_code=415, detail=f"File type {file_extension} not allowed. Only PDF and JPG files are supported.")
         
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"{upload_dir}/{unique_filename}"
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(contents)
+        # Copy to disk in chunks, validating file size (max 10MB) as it goes
+        saved = await save_upload_file(file, upload_dir)
         
         # Store file info in database
         file_record = {
             "id": str(uuid.uuid4()),
             "job_id": job_id,
             "original_filename": file.filename,
-            "stored_filename": unique_filename,
-            "file_path": file_path,
-            "file_size": len(contents),
+            **saved,
             "content_type": file.content_type,
             "uploaded_by": current_user.id,
             "uploaded_at": datetime.utcnow()
@@ -1104,7 +2977,7 @@ async def upload_chat_files(
         uploaded_files.append({
             "id": file_record["id"],
             "filename": file.filename,
-            "size": len(contents),
+            "size": saved["file_size"],
             "content_type": file.content_type
         })
     
@@ -1191,33 +3064,21 @@ async def send_message_with_files(
         os.makedirs(upload_dir, exist_ok=True)
         
         for file in files:
-            # Validate file size (max 10MB)
-            contents = await file.read()
-            if len(contents) > 10 * 1024 * 1024:  # 10MB
-                raise HTTPException(status_code=413, detail=f"File {file.filename} is too large (max 10MB)")
-            
             # Validate file type - Only PDF and JPG allowed
             allowed_extensions = {'.pdf', '.jpg', '.jpeg'}
             file_extension = Path(file.filename).suffix.lower()
             if file_extension not in allowed_extensions:
                 raise HTTPException(status_code=415, detail=f"File type {file_extension} not allowed. Only PDF and JPG files are supported.")
             
-            # Generate unique filename
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = f"{upload_dir}/{unique_filename}"
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                buffer.write(contents)
+            # Copy to disk in chunks, validating file size (max 10MB) as it goes
+            saved = await save_upload_file(file, upload_dir)
             
             # Store file info in database
             file_record = {
                 "id": str(uuid.uuid4()),
                 "job_id": job_id,
                 "original_filename": file.filename,
-                "stored_filename": unique_filename,
-                "file_path": file_path,
-                "file_size": len(contents),
+                **saved,
                 "content_type": file.content_type,
                 "uploaded_by": current_user.id,
                 "uploaded_at": datetime.utcnow()
@@ -1228,7 +3089,7 @@ async def send_message_with_files(
             file_attachments.append({
                 "id": file_record["id"],
                 "filename": file.filename,
-                "size": len(contents),
+                "size": saved["file_size"],
                 "content_type": file.content_type
             })
     
@@ -1241,7 +3102,9 @@ async def send_message_with_files(
         file_attachments=file_attachments
     )
     
-    await db.chat_messages.insert_one(chat_msg.dict())
+    await insert_chat_message(chat_msg)
+    await record_conversation_message(job, chat_msg)
+    await record_chat_rollup(chat_msg.created_at)
     
     # Create notification for receiver
     notification = Notification(
@@ -1251,7 +3114,9 @@ async def send_message_with_files(
         type="chat_message",
         related_job_id=job_id
     )
-    await db.notifications.insert_one(notification.dict())
+    await task_queue.enqueue("create_notifications", {"notifications": [notification.dict()]})
+    
+    await event_bus.publish([receiver_id, current_user.id], "chat_message", chat_msg.dict())
     
     return {"message": "Message sent successfully", "chat_message": chat_msg, "files_uploaded": len(file_attachments)}
 
@@ -1299,7 +3164,9 @@ async def send_message(job_id: str, message_data: ChatMessageCreate, current_use
         file_attachments=[]
     )
     
-    await db.chat_messages.insert_one(message.dict())
+    await insert_chat_message(message)
+    await record_conversation_message(job, message)
+    await record_chat_rollup(message.created_at)
     
     # Create notification for receiver
     notification = Notification(
@@ -1309,198 +3176,267 @@ async def send_message(job_id: str, message_data: ChatMessageCreate, current_use
         type="chat_message",
         related_job_id=job_id
     )
-    await db.notifications.insert_one(notification.dict())
+    await task_queue.enqueue("create_notifications", {"notifications": [notification.dict()]})
+    
+    await event_bus.publish([receiver_id, current_user.id], "chat_message", message.dict())
     
     return {"message": "Message sent successfully", "chat_message": message}
 
 @api_router.get("/admin/chats")
-async def get_all_chats(current_user: User = Depends(require_admin)):
+async def get_all_chats(current_user: User = Depends(require_admin), loaders: Loaders = Depends(get_loaders)):
     # Get all jobs with their chat activity
     jobs = await db.jobs.find({"status": "awarded"}).to_list(1000)
     
-    chat_activity = []
-    for job in jobs:
-        message_count = await db.chat_messages.count_documents({"job_id": job["id"]})
-        if message_count > 0:
-            last_message = await db.chat_messages.find_one(
-                {"job_id": job["id"]}, 
-                sort=[("created_at", -1)]
-            )
-            
-            # Get participants
-            buyer = await db.users.find_one({"id": job["posted_by"]})
-            awarded_bid = await db.bids.find_one({"job_id": job["id"], "status": "awarded"})
-            supplier = await db.users.find_one({"id": awarded_bid["supplier_id"]}) if awarded_bid else None
-            
-            chat_activity.append({
-                "job_id": job["id"],
-                "job_title": job["title"],
-                "message_count": message_count,
-                "last_message_at": last_message["created_at"] if last_message else None,
-                "participants": {
-                    "buyer": {"company_name": buyer["company_name"], "email": buyer["email"]} if buyer else None,
-                    "supplier": {"company_name": supplier["company_name"], "email": supplier["email"]} if supplier else None
-                }
-            })
-    
-    return sorted(chat_activity, key=lambda x: x["last_message_at"] or x["job_id"], reverse=True)
-
-# Get user's active chats
-@api_router.get("/chats")
-async def get_user_chats(current_user: User = Depends(get_current_user)):
-    if current_user.role == UserRole.ADMIN:
-        return await get_all_chats(current_user)
-    
-    # Get jobs where user has participated in chat conversations OR has awarded jobs
-    user_chats = []
-    
-    # Get all jobs where user has sent or received messages
-    pipeline = [
-        {
-            "$match": {
-                "$or": [
-                    {"sender_id": current_user.id},
-                    {"receiver_id": current_user.id}
-                ]
-            }
-        },
+    # Message counts and latest message time for every awarded job in one pass
+    chat_stats = await db.chat_messages.aggregate([
+        {"$match": {"job_id": {"$in": [job["id"] for job in jobs]}}},
         {
             "$group": {
                 "_id": "$job_id",
                 "message_count": {"$sum": 1},
-                "last_message_time": {"$max": "$created_at"},
-                "unread_count": {
-                    "$sum": {
-                        "$cond": [
-                            {
-                                "$and": [
-                                    {"$eq": ["$receiver_id", current_user.id]},
-                                    {"$eq": ["$read", False]}
-                                ]
-                            },
-                            1,
-                            0
-                        ]
-                    }
-                }
+                "last_message_at": {"$max": "$created_at"}
             }
         }
-    ]
+    ]).to_list(None)
+    stats_by_job = {stat["_id"]: stat for stat in chat_stats}
+    active_jobs = [job for job in jobs if job["id"] in stats_by_job]
     
-    chat_stats = await db.chat_messages.aggregate(pipeline).to_list(100)
-    chat_job_ids = set()
+    # Get participants
+    awarded_bids = await loaders.awarded_bids.load_many([job["id"] for job in active_jobs])
+    participant_ids = [job["posted_by"] for job in active_jobs]
+    participant_ids += [bid["supplier_id"] for bid in awarded_bids if bid]
+    participants = dict(zip(participant_ids, await loaders.users.load_many(participant_ids)))
     
-    # Get job details for each chat with messages
-    for chat_stat in chat_stats:
-        job_id = chat_stat["_id"]
-        job = await db.jobs.find_one({"id": job_id})
+    chat_activity = []
+    for job, awarded_bid in zip(active_jobs, awarded_bids):
+        stats = stats_by_job[job["id"]]
+        buyer = participants.get(job["posted_by"])
+        supplier = participants.get(awarded_bid["supplier_id"]) if awarded_bid else None
         
-        if job:
-            chat_job_ids.add(job_id)
-            # Get last message content
-            last_message = await db.chat_messages.find_one(
-                {"job_id": job_id}, 
-                sort=[("created_at", -1)]
-            )
-            
-            # Get other participant info
-            other_participant = None
-            if job["posted_by"] == current_user.id:
-                # Current user is buyer, find awarded supplier
-                awarded_bid = await db.bids.find_one({"job_id": job_id, "status": "awarded"})
-                if awarded_bid:
-                    other_participant = await db.users.find_one({"id": awarded_bid["supplier_id"]})
-            else:
-                # Current user is supplier, other participant is buyer
-                other_participant = await db.users.find_one({"id": job["posted_by"]})
-            
-            user_chats.append({
-                "job_id": job_id,
-                "job_title": job["title"],
-                "job_status": job.get("status", "unknown"),
-                "message_count": chat_stat["message_count"],
-                "unread_count": chat_stat["unread_count"],
-                "last_message_at": chat_stat["last_message_time"],
-                "last_message": last_message["message"] if last_message else None,
-                "last_sender": last_message.get("sender_id") if last_message else None,
-                "other_participant": {
-                    "id": other_participant["id"],
-                    "company_name": other_participant["company_name"],
-                    "role": other_participant["role"]
-                } if other_participant else None
-            })
+        chat_activity.append({
+            "job_id": job["id"],
+            "job_title": job["title"],
+            "message_count": stats["message_count"],
+            "last_message_at": stats["last_message_at"],
+            "participants": {
+                "buyer": {"company_name": buyer["company_name"], "email": buyer["email"]} if buyer else None,
+                "supplier": {"company_name": supplier["company_name"], "email": supplier["email"]} if supplier else None
+            }
+        })
     
-    # Also get awarded jobs where current user is involved but no messages yet
-    if current_user.role == UserRole.BUYER:
-        # Get jobs posted by buyer that are awarded but don't have chats yet
-        awarded_jobs = await db.jobs.find({
-            "posted_by": current_user.id,
-            "status": "awarded"
-        }).to_list(100)
-        
-        for job in awarded_jobs:
-            if job["id"] not in chat_job_ids:
-                # This awarded job doesn't have messages yet
-                awarded_bid = await db.bids.find_one({"job_id": job["id"], "status": "awarded"})
-                if awarded_bid:
-                    supplier = await db.users.find_one({"id": awarded_bid["supplier_id"]})
-                    user_chats.append({
-                        "job_id": job["id"],
-                        "job_title": job["title"],
-                        "job_status": job.get("status", "awarded"),
-                        "message_count": 0,
-                        "unread_count": 0,
-                        "last_message_at": None,
-                        "last_message": None,
-                        "last_sender": None,
-                        "other_participant": {
-                            "id": supplier["id"],
-                            "company_name": supplier["company_name"],
-                            "role": supplier["role"]
-                        } if supplier else None
-                    })
-    
-    elif current_user.role in [UserRole.SUPPLIER, UserRole.SALESMAN]:
-        # Get jobs where current user has awarded bids but no messages yet
-        awarded_bids = await db.bids.find({
-            "supplier_id": current_user.id,
-            "status": "awarded"
-        }).to_list(100)
-        
-        for bid in awarded_bids:
-            if bid["job_id"] not in chat_job_ids:
-                # This awarded job doesn't have messages yet
-                job = await db.jobs.find_one({"id": bid["job_id"]})
-                if job:
-                    buyer = await db.users.find_one({"id": job["posted_by"]})
-                    user_chats.append({
-                        "job_id": job["id"],
-                        "job_title": job["title"],
-                        "job_status": job.get("status", "awarded"),
-                        "message_count": 0,
-                        "unread_count": 0,
-                        "last_message_at": None,
-                        "last_message": None,
-                        "last_sender": None,
-                        "other_participant": {
-                            "id": buyer["id"],
-                            "company_name": buyer["company_name"],
-                            "role": buyer["role"]
-                        } if buyer else None
-                    })
-    
-    # Sort by last message time (most recent first), with awarded jobs without messages at the top
-    return sorted(user_chats, key=lambda x: x["last_message_at"] or datetime.min, reverse=True)
+    return sorted(chat_activity, key=lambda x: x["last_message_at"] or x["job_id"], reverse=True)
+
+# Get user's active chats
+@api_router.get("/chats")
+async def get_user_chats(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
+):
+    if current_user.role == UserRole.ADMIN:
+        return await get_all_chats(current_user, loaders)
+    
+    # Jobs where the user has exchanged messages or holds the award, most recently active first
+    conversations = await fetch_page(
+        db.conversations, {"participant_ids": current_user.id}, cursor, limit, response,
+        sort_fields=("last_activity_at", "job_id")
+    )
+    
+    user_chats = []
+    for conversation in conversations:
+        other_id = conversation["supplier_id"] if conversation["buyer_id"] == current_user.id else conversation["buyer_id"]
+        other_participant = conversation["participants"].get(other_id) if other_id else None
+        user_chats.append({
+            "job_id": conversation["job_id"],
+            "job_title": conversation["job_title"],
+            "job_status": conversation["job_status"],
+            "message_count": conversation["message_count"],
+            "unread_count": conversation["unread_counts"].get(current_user.id, 0),
+            "last_message_at": conversation["last_message_at"],
+            "last_message": conversation["last_message"],
+            "last_sender": conversation["last_sender"],
+            "other_participant": other_participant
+        })
+    
+    return user_chats
 
 @api_router.post("/chats/{job_id}/mark-read")
 async def mark_chat_read(job_id: str, current_user: User = Depends(get_current_user)):
+    unread_filter = {"job_id": job_id, "receiver_id": current_user.id, "read": False}
+    senders = await db.chat_messages.distinct("sender_id", unread_filter)
     result = await db.chat_messages.update_many(
-        {"job_id": job_id, "receiver_id": current_user.id, "read": False},
+        unread_filter,
         {"$set": {"read": True}}
     )
+    await db.conversations.update_one(
+        {"job_id": job_id},
+        {"$set": {f"unread_counts.{current_user.id}": 0}}
+    )
+    if result.modified_count:
+        await bump_versions("conversations", f"chat:{job_id}")
+        # Let the senders see the read receipt and the reader's other tabs clear their badge
+        await event_bus.publish(
+            [current_user.id, *senders],
+            "chat_read",
+            {"job_id": job_id, "reader_id": current_user.id, "count": result.modified_count}
+        )
     
     return {"message": f"Marked {result.modified_count} messages as read"}
 
+# Database indexes
+# Applied idempotently at startup - (collection, keys, options)
+INDEX_MANIFEST = [
+    ("users", [("id", 1)], {"unique": True}),
+    ("users", [("email", 1)], {"unique": True}),
+    ("users", [("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("id", 1)], {"unique": True}),
+    ("jobs", [("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("status", 1), ("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("posted_by", 1), ("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("status", 1), ("category", 1), ("location", 1), ("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("status", 1), ("location", 1), ("created_at", -1), ("id", -1)], {}),
+    ("jobs", [("status", 1), ("title", "text"), ("description", "text")], {"weights": {"title": 5, "description": 1}, "name": "job_search_text"}),
+    ("job_facet_counts", [("category", 1), ("location", 1), ("budget_range", 1)], {"unique": True}),
+    ("bids", [("id", 1)], {"unique": True}),
+    ("bids", [("created_at", -1), ("id", -1)], {}),
+    ("bids", [("job_id", 1), ("created_at", -1), ("id", -1)], {}),
+    ("bids", [("job_id", 1), ("status", 1)], {}),
+    ("bids", [("job_id", 1), ("supplier_id", 1)], {}),
+    ("bids", [("supplier_id", 1), ("created_at", -1), ("id", -1)], {}),
+    ("notifications", [("id", 1)], {"unique": True}),
+    ("notifications", [("user_id", 1), ("created_at", -1), ("id", -1)], {}),
+    ("notifications", [("user_id", 1), ("read", 1), ("created_at", -1)], {}),
+    ("chat_messages", [("id", 1)], {"unique": True}),
+    ("chat_messages", [("job_id", 1), ("created_at", 1), ("id", 1)], {}),
+    ("chat_messages", [("job_id", 1), ("seq", 1)], {}),
+    ("chat_sequences", [("job_id", 1)], {"unique": True}),
+    ("chat_messages", [("sender_id", 1), ("created_at", -1)], {}),
+    ("chat_messages", [("receiver_id", 1), ("read", 1), ("created_at", -1)], {}),
+    ("job_files", [("id", 1)], {"unique": True}),
+    ("job_files", [("job_id", 1), ("uploaded_at", -1)], {}),
+    ("bid_files", [("id", 1)], {"unique": True}),
+    ("bid_files", [("bid_id", 1), ("uploaded_at", -1)], {}),
+    ("chat_files", [("id", 1)], {"unique": True}),
+    ("chat_files", [("job_id", 1), ("uploaded_at", -1)], {}),
+    ("password_resets", [("email", 1)], {"unique": True}),
+    ("password_resets", [("id", 1)], {}),
+    ("payment_orders", [("order_id", 1)], {"unique": True}),
+    ("conversations", [("job_id", 1)], {"unique": True}),
+    ("dashboard_counters", [("id", 1)], {"unique": True}),
+    ("supplier_preferences", [("id", 1)], {"unique": True}),
+    ("versions", [("id", 1)], {"unique": True}),
+    ("tasks", [("id", 1)], {"unique": True}),
+    ("deletions", [("id", 1)], {"unique": True}),
+    ("notifications", [("related_job_id", 1)], {}),
+    ("tasks", [("status", 1), ("run_at", 1)], {}),
+    ("tasks", [("status", 1), ("locked_at", 1)], {}),
+    # Finished tasks are kept for a week for inspection
+    ("tasks", [("finished_at", 1)], {"expireAfterSeconds": 7 * 24 * 3600}),
+    ("chat_rollups", [("id", 1)], {"unique": True}),
+    ("chat_rollups", [("granularity", 1), ("bucket", 1)], {}),
+    ("conversations", [("message_count", 1)], {}),
+    ("conversations", [("participant_ids", 1), ("last_activity_at", -1), ("job_id", -1)], {}),
+    ("leases", [("id", 1)], {"unique": True}),
+    ("chat_tombstones", [("job_id", 1), ("deleted_at", 1), ("id", 1)], {}),
+    # Open chats sync at least every 30 seconds, so tombstones only need to outlive a long-idle tab
+    ("chat_tombstones", [("deleted_at", 1)], {"expireAfterSeconds": 7 * 24 * 3600}),
+]
+
+async def ensure_indexes() -> Dict:
+    """Create every index in INDEX_MANIFEST, skipping (and logging) any that conflict with existing data"""
+    created, failed = [], []
+    for collection, keys, options in INDEX_MANIFEST:
+        try:
+            name = await db[collection].create_index(keys, **options)
+            created.append(f"{collection}.{name}")
+        except Exception as e:
+            # Duplicate data or a same-key index with different options - leave it for an admin to resolve
+            logger.warning(f"Could not create index {keys} on {collection}: {e}")
+            failed.append({"collection": collection, "keys": keys, "error": str(e)})
+    return {"created": created, "failed": failed}
+
+# Representative shape of each hot query in this module - (name, collection, filter, sort)
+HOT_QUERIES = [
+    ("auth user by id", "users", {"id": "sample"}, None),
+    ("login user by email", "users", {"email": "sample@example.com"}, None),
+    ("job by id", "jobs", {"id": "sample"}, None),
+    ("open jobs feed", "jobs", {"status": "open"}, [("created_at", -1), ("id", -1)]),
+    ("buyer's jobs", "jobs", {"posted_by": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("job search by category", "jobs", {"status": "open", "category": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("job search by location", "jobs", {"status": "open", "location": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("bids for job", "bids", {"job_id": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("awarded bid for job", "bids", {"job_id": "sample", "status": "awarded"}, None),
+    ("supplier's bid on job", "bids", {"job_id": "sample", "supplier_id": "sample"}, None),
+    ("supplier's bids", "bids", {"supplier_id": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("user notifications", "notifications", {"user_id": "sample"}, [("created_at", -1), ("id", -1)]),
+    ("unread notifications", "notifications", {"user_id": "sample", "read": False}, None),
+    ("job chat history", "chat_messages", {"job_id": "sample"}, [("created_at", 1), ("id", 1)]),
+    ("job chat sync", "chat_messages", {"job_id": "sample", "seq": {"$gt": 0}}, [("seq", 1)]),
+    ("unread chat messages", "chat_messages", {"job_id": "sample", "receiver_id": "sample", "read": False}, None),
+    ("job files", "job_files", {"job_id": "sample"}, [("uploaded_at", -1)]),
+    ("bid files", "bid_files", {"bid_id": "sample"}, [("uploaded_at", -1)]),
+    ("chat files", "chat_files", {"job_id": "sample"}, [("uploaded_at", -1)]),
+    ("password reset code", "password_resets", {"email": "sample@example.com", "reset_code": "000000", "used": False}, None),
+    ("payment order", "payment_orders", {"order_id": "sample"}, None),
+    ("user chat list", "conversations", {"participant_ids": "sample"}, [("last_activity_at", -1), ("job_id", -1)]),
+]
+
+def _plan_stages(plan, stages: List[str], index_names: List[str]):
+    """Collect stage and index names from an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        if "indexName" in plan:
+            index_names.append(plan["indexName"])
+        for value in plan.values():
+            _plan_stages(value, stages, index_names)
+    elif isinstance(plan, list):
+        for item in plan:
+            _plan_stages(item, stages, index_names)
+
+@api_router.post("/admin/system/rebuild-conversations")
+async def rebuild_conversations(current_user: User = Depends(require_admin)):
+    """Recompute every chat conversation summary from the underlying messages and bids"""
+    rebuilt = await rebuild_all_conversations()
+    return {"message": f"Rebuilt {rebuilt} conversations"}
+
+@api_router.get("/admin/system/index-report")
+async def get_index_report(current_user: User = Depends(require_admin)):
+    """Run explain() on each hot query and flag any that fall back to a collection scan"""
+    report = []
+    for name, collection, query, sort in HOT_QUERIES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            explain = await cursor.explain()
+        except Exception as e:
+            report.append({"query": name, "collection": collection, "error": str(e)})
+            continue
+        
+        stages, index_names = [], []
+        _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}), stages, index_names)
+        execution_stats = explain.get("executionStats", {})
+        report.append({
+            "query": name,
+            "collection": collection,
+            "filter": query,
+            "sort": sort,
+            "stages": stages,
+            "indexes_used": sorted(set(index_names)),
+            "collection_scan": "COLLSCAN" in stages,
+            "in_memory_sort": "SORT" in stages,
+            "docs_examined": execution_stats.get("totalDocsExamined"),
+            "keys_examined": execution_stats.get("totalKeysExamined")
+        })
+    
+    return {
+        "queries": report,
+        "collection_scans": [entry["query"] for entry in report if entry.get("collection_scan")]
+    }
+
 @api_router.post("/admin/system/optimize-chat-indexes")
 async def optimize_chat_indexes(current_user: User = Depends(require_admin)):
     """Create database indexes to optimize chat performance and ensure message persistence"""
@@ -1543,55 +3479,167 @@ async def optimize_chat_indexes(current_user: User = Depends(require_admin)):
             "chat_persistence": "may be affected"
         }
 
+@api_router.get("/admin/system/cache-stats")
+async def get_cache_stats(current_user: User = Depends(require_admin)):
+    """Hit/miss counters for the authenticated-user cache and password hashing queue depth"""
+    return {"user_cache": user_cache.stats(), "password_hash_pool": password_hash_pool.stats()}
+
+@api_router.get("/admin/system/tasks")
+async def get_task_queue_status(current_user: User = Depends(require_admin)):
+    """Background task counts by status, plus any that have failed for good"""
+    counts = {entry["_id"]: entry["count"] async for entry in db.tasks.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ])}
+    failed = await db.tasks.find(
+        {"status": "failed"},
+        {"_id": 0, "payload": 0}
+    ).sort("finished_at", -1).to_list(50)
+    return {"queue": task_queue.stats(), "email": email_sender.stats(), "counts": counts, "recent_failures": failed}
+
+# Chat analytics rollups
+# Hourly and daily message counts plus an all-time "totals" document, maintained on every send and delete
+CHAT_ROLLUP_TOTALS = "totals"
+
+def _hour_bucket(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+def _day_bucket(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+async def record_chat_rollup(created_at: datetime, delta: int = 1):
+    """Add (or with a negative delta, remove) a message in the rollups for its hour and day"""
+    hour = _hour_bucket(created_at)
+    day = _day_bucket(created_at)
+    totals_update = {"$inc": {"message_count": delta}}
+    if delta > 0:
+        totals_update["$min"] = {"first_message_at": created_at}
+    await db.chat_rollups.bulk_write([
+        UpdateOne({"id": f"hour:{hour.isoformat()}"}, {"$inc": {"message_count": delta}, "$setOnInsert": {"granularity": "hour", "bucket": hour}}, upsert=True),
+        UpdateOne({"id": f"day:{day.isoformat()}"}, {"$inc": {"message_count": delta}, "$setOnInsert": {"granularity": "day", "bucket": day}}, upsert=True),
+        UpdateOne({"id": CHAT_ROLLUP_TOTALS}, totals_update, upsert=True)
+    ], ordered=False)
+
+async def rebuild_chat_rollups() -> int:
+    """Compact chat_messages into hourly and daily rollups from scratch"""
+    operations = []
+    for granularity, date_format, parse_format in [("hour", "%Y-%m-%dT%H", "%Y-%m-%dT%H"), ("day", "%Y-%m-%d", "%Y-%m-%d")]:
+        async for entry in db.chat_messages.aggregate([
+            {"$group": {"_id": {"$dateToString": {"format": date_format, "date": "$created_at"}}, "count": {"$sum": 1}}}
+        ]):
+            bucket = datetime.strptime(entry["_id"], parse_format)
+            operations.append(ReplaceOne(
+                {"id": f"{granularity}:{bucket.isoformat()}"},
+                {"id": f"{granularity}:{bucket.isoformat()}", "granularity": granularity, "bucket": bucket, "message_count": entry["count"]},
+                upsert=True
+            ))
+    
+    totals = {"id": CHAT_ROLLUP_TOTALS, "message_count": await db.chat_messages.count_documents({})}
+    oldest_message = await db.chat_messages.find_one({}, sort=[("created_at", 1)])
+    if oldest_message:
+        # Left unset rather than null - null sorts below every date and would pin $min
+        totals["first_message_at"] = oldest_message["created_at"]
+    operations.append(ReplaceOne({"id": CHAT_ROLLUP_TOTALS}, totals, upsert=True))
+    
+    await db.chat_rollups.delete_many({})
+    await db.chat_rollups.bulk_write(operations, ordered=False)
+    return len(operations) - 1
+
+async def forget_chat_rollups(match: Dict):
+    """Take the messages matching `match` out of the rollups before they are bulk deleted"""
+    hours: Dict[datetime, int] = {}
+    async for entry in db.chat_messages.aggregate([
+        {"$match": match},
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%dT%H", "date": "$created_at"}}, "count": {"$sum": 1}}}
+    ]):
+        hours[datetime.strptime(entry["_id"], "%Y-%m-%dT%H")] = entry["count"]
+    if not hours:
+        return
+    
+    days: Dict[datetime, int] = {}
+    for hour, count in hours.items():
+        days[_day_bucket(hour)] = days.get(_day_bucket(hour), 0) + count
+    await db.chat_rollups.bulk_write(
+        [UpdateOne({"id": f"hour:{hour.isoformat()}"}, {"$inc": {"message_count": -count}}) for hour, count in hours.items()]
+        + [UpdateOne({"id": f"day:{day.isoformat()}"}, {"$inc": {"message_count": -count}}) for day, count in days.items()]
+        + [UpdateOne({"id": CHAT_ROLLUP_TOTALS}, {"$inc": {"message_count": -sum(hours.values())}})],
+        ordered=False
+    )
+
+async def _sum_rollups(granularity: str, start: datetime, end: datetime) -> int:
+    if start >= end:
+        return 0
+    result = await db.chat_rollups.aggregate([
+        {"$match": {"granularity": granularity, "bucket": {"$gte": start, "$lt": end}}},
+        {"$group": {"_id": None, "total": {"$sum": "$message_count"}}}
+    ]).to_list(1)
+    return result[0]["total"] if result else 0
+
+async def count_messages_between(start: datetime, end: datetime) -> int:
+    """Message count in [start, end) to hour precision - whole days from daily rollups, the edges from hourly ones"""
+    start = _hour_bucket(start)
+    first_full_day = _day_bucket(start) if start == _day_bucket(start) else _day_bucket(start) + timedelta(days=1)
+    last_full_day = _day_bucket(end)
+    if first_full_day >= last_full_day:
+        return await _sum_rollups("hour", start, end)
+    return (
+        await _sum_rollups("hour", start, first_full_day)
+        + await _sum_rollups("day", first_full_day, last_full_day)
+        + await _sum_rollups("hour", last_full_day, end)
+    )
+
+@api_router.post("/admin/system/rebuild-chat-rollups")
+async def rebuild_chat_analytics_rollups(current_user: User = Depends(require_admin)):
+    buckets = await rebuild_chat_rollups()
+    return {"message": f"Rebuilt {buckets} chat rollup buckets"}
+
 @api_router.get("/admin/chat-analytics")
-async def get_chat_analytics(current_user: User = Depends(require_admin)):
-    """Get comprehensive chat analytics and persistence verification"""
+async def get_chat_analytics(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    current_user: User = Depends(require_admin)
+):
+    """Get comprehensive chat analytics and persistence verification.
+    
+    Answered from the chat rollups. Pass start/end for a per-hour or per-day series over any range.
+    """
+    # Stored timestamps are naive UTC - bring offset-aware query values onto the same footing
+    if start and start.tzinfo:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and end.tzinfo:
+        end = end.astimezone(timezone.utc).replace(tzinfo=None)
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    
     try:
-        # Get total message statistics
-        total_messages = await db.chat_messages.count_documents({})
+        totals = await db.chat_rollups.find_one({"id": CHAT_ROLLUP_TOTALS}) or {}
+        total_messages = totals.get("message_count", 0)
         
         # Get message age distribution
         now = datetime.utcnow()
-        day_ago = now - timedelta(days=1)
-        week_ago = now - timedelta(weeks=1)
-        month_ago = now - timedelta(days=30)
-        
-        messages_today = await db.chat_messages.count_documents({
-            "created_at": {"$gte": day_ago}
-        })
-        
-        messages_week = await db.chat_messages.count_documents({
-            "created_at": {"$gte": week_ago}
-        })
-        
-        messages_month = await db.chat_messages.count_documents({
-            "created_at": {"$gte": month_ago}
-        })
-        
+        end_of_hour = _hour_bucket(now) + timedelta(hours=1)
+        messages_today = await count_messages_between(now - timedelta(days=1), end_of_hour)
+        messages_week = await count_messages_between(now - timedelta(weeks=1), end_of_hour)
+        messages_month = await count_messages_between(now - timedelta(days=30), end_of_hour)
         messages_older = total_messages - messages_month
         
-        # Get oldest message
-        oldest_message = await db.chat_messages.find_one(
-            {}, sort=[("created_at", 1)]
-        )
-        
         # Get active conversations
-        active_chats = await db.chat_messages.distinct("job_id")
+        active_chats = await db.conversations.count_documents({"message_count": {"$gt": 0}})
         
         # Check for any TTL indexes that might cause deletion
         indexes = await db.chat_messages.list_indexes().to_list(100)
         ttl_indexes = [idx for idx in indexes if 'expireAfterSeconds' in idx]
         
-        return {
+        analytics = {
             "total_messages": total_messages,
-            "active_conversations": len(active_chats),
+            "active_conversations": active_chats,
             "message_distribution": {
                 "last_24_hours": messages_today,
                 "last_week": messages_week,
                 "last_month": messages_month,
                 "older_than_month": messages_older
             },
-            "oldest_message_date": oldest_message.get("created_at") if oldest_message else None,
+            "oldest_message_date": totals.get("first_message_at"),
             "data_retention": {
                 "automatic_deletion": len(ttl_indexes) > 0,
                 "ttl_indexes_found": len(ttl_indexes),
@@ -1599,41 +3647,214 @@ async def get_chat_analytics(current_user: User = Depends(require_admin)):
             },
             "system_health": "chat_persistence_active" if len(ttl_indexes) == 0 else "chat_deletion_risk"
         }
+        
+        if start or end:
+            range_end = end or end_of_hour
+            range_start = start or range_end - timedelta(days=30)
+            first_bucket = _hour_bucket(range_start) if granularity == "hour" else _day_bucket(range_start)
+            buckets = await db.chat_rollups.find(
+                {"granularity": granularity, "bucket": {"$gte": first_bucket, "$lt": range_end}},
+                {"_id": 0, "bucket": 1, "message_count": 1}
+            ).sort("bucket", 1).to_list(None)
+            analytics["range"] = {
+                "start": range_start,
+                "end": range_end,
+                "granularity": granularity,
+                "total_messages": await count_messages_between(range_start, range_end),
+                "series": buckets
+            }
+        
+        return analytics
     except Exception as e:
         return {
             "error": f"Analytics generation failed: {str(e)}",
             "system_health": "unknown"
         }
 
+# Dashboard counters
+# One document per user plus a "global" one, kept current with $inc on every write that changes a count
+COUNTER_FIELDS = ["total_users", "total_jobs", "active_jobs", "total_bids", "total_bids_received", "won_bids", "unread_notifications"]
+GLOBAL_COUNTERS = "global"
+COUNTER_RECONCILE_SECONDS = float(os.environ.get('COUNTER_RECONCILE_SECONDS', 3600))
+
+async def bump_counters(increments: Dict[str, Dict[str, int]], session=None):
+    """Apply {counter_id: {field: delta}} as one unordered bulk write of upserting $inc updates"""
+    operations = []
+    for counter_id, fields in increments.items():
+        fields = {field: delta for field, delta in fields.items() if delta}
+        if fields:
+            operations.append(UpdateOne({"id": counter_id}, {"$inc": fields}, upsert=True))
+    if operations:
+        await db.dashboard_counters.bulk_write(operations, ordered=False, session=session)
+
+async def reconcile_counters() -> int:
+    """Recompute every counter from the source collections, correcting any drift.
+    
+    Each counter is only overwritten if it still holds the value read before the recount, so an
+    $inc that lands mid-pass is never lost - that counter is simply left for the next pass.
+    """
+    reconciled_at = datetime.utcnow()
+    snapshot = {
+        doc["id"]: {field: doc.get(field) for field in COUNTER_FIELDS}
+        async for doc in db.dashboard_counters.find({}, {"_id": 0, "id": 1, **{field: 1 for field in COUNTER_FIELDS}})
+    }
+    counters: Dict[str, Dict[str, int]] = {}
+    
+    def counter(counter_id: str) -> Dict[str, int]:
+        return counters.setdefault(counter_id, {field: 0 for field in COUNTER_FIELDS})
+    
+    global_counter = counter(GLOBAL_COUNTERS)
+    global_counter["total_users"] = await db.users.count_documents({})
+    global_counter["total_jobs"] = await db.jobs.count_documents({})
+    global_counter["active_jobs"] = await db.jobs.count_documents({"status": "open"})
+    global_counter["total_bids"] = await db.bids.count_documents({})
+    
+    async for entry in db.jobs.aggregate([
+        {"$group": {
+            "_id": "$posted_by",
+            "total": {"$sum": 1},
+            "active": {"$sum": {"$cond": [{"$eq": ["$status", "open"]}, 1, 0]}}
+        }}
+    ]):
+        counter(entry["_id"]).update(total_jobs=entry["total"], active_jobs=entry["active"])
+    
+    async for entry in db.bids.aggregate([
+        {"$group": {
+            "_id": "$supplier_id",
+            "total": {"$sum": 1},
+            "won": {"$sum": {"$cond": [{"$eq": ["$status", "awarded"]}, 1, 0]}}
+        }}
+    ]):
+        counter(entry["_id"]).update(total_bids=entry["total"], won_bids=entry["won"])
+    
+    async for entry in db.bids.aggregate([
+        {"$lookup": {"from": "jobs", "localField": "job_id", "foreignField": "id", "as": "job"}},
+        {"$unwind": "$job"},
+        {"$group": {"_id": "$job.posted_by", "received": {"$sum": 1}}}
+    ]):
+        counter(entry["_id"])["total_bids_received"] = entry["received"]
+    
+    async for entry in db.notifications.aggregate([
+        {"$match": {"read": False}},
+        {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+    ]):
+        counter(entry["_id"])["unread_notifications"] = entry["unread"]
+    
+    operations = []
+    for counter_id, fields in counters.items():
+        if counter_id in snapshot:
+            operations.append(UpdateOne(
+                {"id": counter_id, **snapshot[counter_id]},
+                {"$set": {**fields, "reconciled_at": reconciled_at}}
+            ))
+        else:
+            # Created by a write since the snapshot, if at all - only fill it in if it is still missing
+            operations.append(UpdateOne(
+                {"id": counter_id},
+                {"$setOnInsert": {**fields, "reconciled_at": reconciled_at}},
+                upsert=True
+            ))
+    # Counters for users with nothing left to count, unless something was counted for them mid-pass
+    operations.extend(
+        DeleteOne({"id": counter_id, **fields})
+        for counter_id, fields in snapshot.items() if counter_id not in counters
+    )
+    if operations:
+        await db.dashboard_counters.bulk_write(operations, ordered=False)
+    unread_count_cache.clear()
+    return len(counters)
+
+# Open-job facet counts
+# One document per (category, location, budget_range) holding its number of open jobs, so search totals and
+# facets never scan the jobs. Kept current with $inc wherever a job opens or stops being open, and
+# recomputed with the dashboard counters
+JOB_FACET_FIELDS = ["category", "location", "budget_range"]
+
+def _job_facet_filter(key: tuple) -> Dict:
+    return dict(zip(JOB_FACET_FIELDS, key))
+
+async def bump_job_facets(jobs: List[Dict], delta: int, session=None):
+    """Add `delta` open jobs to the count of each job's (category, location, budget_range)"""
+    increments: Dict[tuple, int] = {}
+    for job in jobs:
+        key = tuple(job.get(field) for field in JOB_FACET_FIELDS)
+        increments[key] = increments.get(key, 0) + delta
+    if increments:
+        await db.job_facet_counts.bulk_write([
+            UpdateOne(_job_facet_filter(key), {"$inc": {"open": change}}, upsert=True)
+            for key, change in increments.items()
+        ], ordered=False, session=session)
+
+async def reconcile_job_facets() -> int:
+    """Recompute the open-job facet counts, with the same compare-and-set as reconcile_counters"""
+    snapshot = {
+        tuple(doc.get(field) for field in JOB_FACET_FIELDS): doc.get("open")
+        async for doc in db.job_facet_counts.find({}, {"_id": 0})
+    }
+    counts = {
+        tuple(entry["_id"].get(field) for field in JOB_FACET_FIELDS): entry["open"]
+        async for entry in db.jobs.aggregate([
+            {"$match": {"status": "open"}},
+            {"$group": {"_id": {field: f"${field}" for field in JOB_FACET_FIELDS}, "open": {"$sum": 1}}}
+        ])
+    }
+    operations = []
+    for key, count in counts.items():
+        if key in snapshot:
+            operations.append(UpdateOne({**_job_facet_filter(key), "open": snapshot[key]}, {"$set": {"open": count}}))
+        else:
+            operations.append(UpdateOne(_job_facet_filter(key), {"$setOnInsert": {"open": count}}, upsert=True))
+    operations.extend(
+        DeleteOne({**_job_facet_filter(key), "open": count})
+        for key, count in snapshot.items() if key not in counts
+    )
+    if operations:
+        await db.job_facet_counts.bulk_write(operations, ordered=False)
+    return len(counts)
+
+async def reconcile_counters_periodically():
+    while True:
+        # One worker reconciles per interval; the lease lapses if that worker goes away
+        if await acquire_lease("counter_reconcile", int(COUNTER_RECONCILE_SECONDS)):
+            try:
+                reconciled = await reconcile_counters()
+                facets = await reconcile_job_facets()
+                logger.info(f"Reconciled {reconciled} dashboard counters and {facets} job facet counts")
+            except Exception as e:
+                logger.error(f"Dashboard counter reconciliation failed: {e}")
+        await asyncio.sleep(COUNTER_RECONCILE_SECONDS)
+
+@api_router.post("/admin/system/reconcile-counters")
+async def reconcile_dashboard_counters(current_user: User = Depends(require_admin)):
+    reconciled = await reconcile_counters()
+    facets = await reconcile_job_facets()
+    return {"message": f"Reconciled {reconciled} dashboard counters and {facets} job facet counts"}
+
 @api_router.get("/dashboard/stats")
 async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
+    counter_id = GLOBAL_COUNTERS if current_user.role == UserRole.ADMIN else current_user.id
+    counters = await db.dashboard_counters.find_one({"id": counter_id}) or {}
+    # Concurrent decrements can briefly dip below zero before reconciliation
+    count = lambda field: max(counters.get(field, 0), 0)
+    
     if current_user.role == UserRole.ADMIN:
-        total_users = await db.users.count_documents({})
-        total_jobs = await db.jobs.count_documents({})
-        total_bids = await db.bids.count_documents({})
-        active_jobs = await db.jobs.count_documents({"status": "open"})
-        
         return {
-            "total_users": total_users,
-            "total_jobs": total_jobs,
-            "total_bids": total_bids,
-            "active_jobs": active_jobs
+            "total_users": count("total_users"),
+            "total_jobs": count("total_jobs"),
+            "total_bids": count("total_bids"),
+            "active_jobs": count("active_jobs")
         }
     elif current_user.role == UserRole.BUYER:
-        total_jobs = await db.jobs.count_documents({"posted_by": current_user.id})
-        active_jobs = await db.jobs.count_documents({"posted_by": current_user.id, "status": "open"})
-        total_bids = await db.bids.count_documents({"job_id": {"$in": [job["id"] async for job in db.jobs.find({"posted_by": current_user.id})]}})
-        
         return {
-            "total_jobs": total_jobs,
-            "active_jobs": active_jobs,
-            "total_bids_received": total_bids,
+            "total_jobs": count("total_jobs"),
+            "active_jobs": count("active_jobs"),
+            "total_bids_received": count("total_bids_received"),
             "subscription_status": current_user.subscription_status,
             "trial_expires_at": current_user.trial_expires_at
         }
     else:  # Supplier
-        total_bids = await db.bids.count_documents({"supplier_id": current_user.id})
-        won_bids = await db.bids.count_documents({"supplier_id": current_user.id, "status": "awarded"})
+        total_bids = count("total_bids")
+        won_bids = count("won_bids")
         
         return {
             "total_bids": total_bids,
@@ -1642,8 +3863,48 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         }
 
 # File upload endpoints
-import aiofiles
-import shutil
+
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+async def save_upload_file(file: UploadFile, upload_dir: str) -> Dict:
+    """Copy an upload to disk chunk by chunk, enforcing the size limit as it goes.
+    
+    Starlette has already spooled the request body to a temporary file by the time this runs,
+    so chunking keeps the copy off the event loop rather than bounding request memory.
+    Returns the stored filename, path, size and SHA-256 checksum.
+    """
+    unique_filename = f"{uuid.uuid4()}{Path(file.filename).suffix.lower()}"
+    file_path = f"{upload_dir}/{unique_filename}"
+    checksum = hashlib.sha256()
+    file_size = 0
+    
+    try:
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_UPLOAD_SIZE:
+                    break
+                checksum.update(chunk)
+                await buffer.write(chunk)
+    except BaseException:
+        # Failed or cancelled mid-write - don't leave a partial file behind
+        try:
+            await aiofiles.os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    if file_size > MAX_UPLOAD_SIZE:
+        await aiofiles.os.remove(file_path)
+        raise HTTPException(status_code=413, detail=f"File {file.filename} is too large (max 10MB)")
+    
+    return {
+        "stored_filename": unique_filename,
+        "file_path": file_path,
+        "file_size": file_size,
+        "checksum": checksum.hexdigest()
+    }
 
 @api_router.post("/upload/job/{job_id}")
 async def upload_job_files(
@@ -1665,33 +3926,21 @@ async def upload_job_files(
     os.makedirs(upload_dir, exist_ok=True)
     
     for file in files:
-        # Validate file size (max 10MB)
-        contents = await file.read()
-        if len(contents) > 10 * 1024 * 1024:  # 10MB
-            raise HTTPException(status_code=413, detail=f"File {file.filename} is too large (max 10MB)")
-        
         # Validate file type
         allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.pdf', '.doc', '.docx', '.txt', '.xlsx', '.xls'}
         file_extension = Path(file.filename).suffix.lower()
         if file_extension not in allowed_extensions:
             raise HTTPException(status_code=415, detail=f"File type {file_extension} not allowed")
         
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"{upload_dir}/{unique_filename}"
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(contents)
+        # Copy to disk in chunks, validating file size (max 10MB) as it goes
+        saved = await save_upload_file(file, upload_dir)
         
         # Store file info in database
         file_record = {
             "id": str(uuid.uuid4()),
             "job_id": job_id,
             "original_filename": file.filename,
-            "stored_filename": unique_filename,
-            "file_path": file_path,
-            "file_size": len(contents),
+            **saved,
             "content_type": file.content_type,
             "uploaded_by": current_user.id,
             "uploaded_at": datetime.utcnow()
@@ -1702,7 +3951,7 @@ async def upload_job_files(
         uploaded_files.append({
             "id": file_record["id"],
             "filename": file.filename,
-            "size": len(contents),
+            "size": saved["file_size"],
             "content_type": file.content_type
         })
     
@@ -1728,33 +3977,21 @@ async def upload_bid_files(
     os.makedirs(upload_dir, exist_ok=True)
     
     for file in files:
-        # Validate file size (max 10MB)
-        contents = await file.read()
-        if len(contents) > 10 * 1024 * 1024:  # 10MB
-            raise HTTPException(status_code=413, detail=f"File {file.filename} is too large (max 10MB)")
-        
         # Validate file type
         allowed_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.pdf', '.doc', '.docx', '.txt', '.xlsx', '.xls'}
         file_extension = Path(file.filename).suffix.lower()
         if file_extension not in allowed_extensions:
             raise HTTPException(status_code=415, detail=f"File type {file_extension} not allowed")
         
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"{upload_dir}/{unique_filename}"
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            buffer.write(contents)
+        # Copy to disk in chunks, validating file size (max 10MB) as it goes
+        saved = await save_upload_file(file, upload_dir)
         
         # Store file info in database
         file_record = {
             "id": str(uuid.uuid4()),
             "bid_id": bid_id,
             "original_filename": file.filename,
-            "stored_filename": unique_filename,
-            "file_path": file_path,
-            "file_size": len(contents),
+            **saved,
             "content_type": file.content_type,
             "uploaded_by": current_user.id,
             "uploaded_at": datetime.utcnow()
@@ -1765,7 +4002,7 @@ async def upload_bid_files(
         uploaded_files.append({
             "id": file_record["id"],
             "filename": file.filename,
-            "size": len(contents),
+            "size": saved["file_size"],
             "content_type": file.content_type
         })
     
@@ -1954,20 +4191,20 @@ async def delete_message(message_id: str, current_user: User = Depends(get_curre
     if message["sender_id"] != current_user.id and current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="You can only delete your own messages")
     
-    # Delete associated files if any
+    # Delete associated files if any - records now, the files on disk in the background
     if message.get("file_attachments"):
-        for file_attachment in message["file_attachments"]:
-            # Find and delete file record
-            file_record = await db.chat_files.find_one({"id": file_attachment["id"]})
-            if file_record:
-                # Delete file from disk
-                if os.path.exists(file_record["file_path"]):
-                    os.remove(file_record["file_path"])
-                # Delete file record from database
-                await db.chat_files.delete_one({"id": file_attachment["id"]})
-    
-    # Delete the message
+        file_ids = [file_attachment["id"] for file_attachment in message["file_attachments"]]
+        file_records = await db.chat_files.find({"id": {"$in": file_ids}}, {"_id": 0, "file_path": 1}).to_list(None)
+        await db.chat_files.delete_many({"id": {"$in": file_ids}})
+        if file_records:
+            await task_queue.enqueue("delete_files", {"paths": [record["file_path"] for record in file_records]})
+    
+    # Delete the message, leaving a tombstone so open chats drop it on their next sync
     await db.chat_messages.delete_one({"id": message_id})
+    await db.chat_tombstones.insert_one({"id": message_id, "job_id": message["job_id"], "deleted_at": datetime.utcnow()})
+    await rebuild_conversation(message["job_id"])
+    await record_chat_rollup(message["created_at"], delta=-1)
+    await event_bus.publish([message["sender_id"], message["receiver_id"]], "chat_message_deleted", {"job_id": message["job_id"], "id": message_id})
     
     return {"message": "Message and associated files deleted successfully"}
 
@@ -1979,17 +4216,158 @@ async def get_support_info():
         "email": SUPPORT_EMAIL
     }
 
+# Conditional GET
+# Polled list endpoints are fingerprinted from version counters that every relevant write bumps,
+# so a client holding the current ETag gets a 304 without the query or serialization running.
+CONDITIONAL_GET_ROUTES = [
+    (re.compile(r"^/api/jobs$"), lambda user_id, match: ["jobs"]),
+    (re.compile(r"^/api/jobs/my$"), lambda user_id, match: ["jobs"]),
+    (re.compile(r"^/api/jobs/search$"), lambda user_id, match: ["jobs"]),
+    (re.compile(r"^/api/jobs/feed$"), lambda user_id, match: ["jobs", "bids"]),
+    (re.compile(r"^/api/bids/my$"), lambda user_id, match: ["jobs", "bids"]),
+    (re.compile(r"^/api/notifications$"), lambda user_id, match: [f"notifications:{user_id}"]),
+    (re.compile(r"^/api/chats$"), lambda user_id, match: ["conversations", "jobs", "users"]),
+    (re.compile(r"^/api/jobs/(?P<job_id>[^/]+)/chat$"), lambda user_id, match: [f"chat:{match['job_id']}", "users"]),
+]
+# Responses that also change with time alone - their ETag rolls over every this many seconds.
+# The feed's recency term drifts slowly, so an hour of a stale ordering is acceptable
+CONDITIONAL_GET_TIME_BUCKETS = {
+    "/api/jobs/feed": float(os.environ.get('FEED_ETAG_BUCKET_SECONDS', 3600)),
+}
+
+async def bump_versions(*keys: str):
+    """Invalidate every ETag derived from these version counters"""
+    if keys:
+        await db.versions.bulk_write(
+            [UpdateOne({"id": key}, {"$inc": {"version": 1}}, upsert=True) for key in keys],
+            ordered=False
+        )
+
+def token_user_id(authorization: str) -> Optional[str]:
+    """User id from a bearer token, or None - the endpoint itself reports auth errors"""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+class ConditionalGetMiddleware:
+    """Answers If-None-Match on the routes in CONDITIONAL_GET_ROUTES and tags their 200s with an ETag"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+        
+        for pattern, version_keys in CONDITIONAL_GET_ROUTES:
+            match = pattern.match(scope["path"])
+            if match:
+                break
+        else:
+            return await self.app(scope, receive, send)
+        
+        headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]}
+        user_id = token_user_id(headers.get("authorization", ""))
+        if user_id is None:
+            return await self.app(scope, receive, send)
+        
+        # Versions are read before the handler runs and writes bump them only after landing,
+        # so a concurrent write can only make the ETag stale, never too new
+        keys = version_keys(user_id, match)
+        versions = {doc["id"]: doc["version"] async for doc in db.versions.find({"id": {"$in": keys}}, {"_id": 0})}
+        fingerprint = f"{user_id}|{scope['path']}?{scope['query_string'].decode('latin-1')}|" + ",".join(
+            f"{key}={versions.get(key, 0)}" for key in keys
+        )
+        bucket_seconds = CONDITIONAL_GET_TIME_BUCKETS.get(scope["path"])
+        if bucket_seconds:
+            fingerprint += f"|t={int(time.time() // bucket_seconds)}"
+        etag = f'"{hashlib.sha1(fingerprint.encode()).hexdigest()[:20]}"'
+        cache_headers = [(b"etag", etag.encode()), (b"cache-control", b"private, no-cache")]
+        
+        if etag in [tag.strip() for tag in headers.get("if-none-match", "").split(",")]:
+            # The token may outlive its user - let the endpoint reject a deleted account
+            try:
+                await get_user_from_token(headers["authorization"].partition(" ")[2])
+            except HTTPException:
+                return await self.app(scope, receive, send)
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": [*message.get("headers", []), *cache_headers]}
+            await send(message)
+        
+        await self.app(scope, receive, send_with_etag)
+
+# Request metrics
+@functools.lru_cache(maxsize=4096)
+def route_template(method: str, path: str) -> str:
+    """The route's path template, so ids in the URL don't explode label cardinality"""
+    scope = {"type": "http", "method": method, "path": path, "root_path": ""}
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+class MetricsMiddleware:
+    """Per-route request counts, latency, in-flight requests and MongoDB commands per request"""
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        labels = {"method": scope["method"], "route": route_template(scope["method"], scope["path"])}
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        db_stats = {"calls": 0, "seconds": 0.0}
+        token = request_db_stats.set(db_stats)
+        metrics.inc("http_requests_in_flight", labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.inc("http_requests_in_flight", labels, -1)
+            metrics.inc("http_requests_total", {**labels, "status": str(status_code)})
+            metrics.observe("http_request_duration_seconds", labels, time.perf_counter() - started)
+            metrics.observe("http_request_db_calls", labels, db_stats["calls"])
+            metrics.inc("http_request_db_seconds_total", labels, db_stats["seconds"])
+            request_db_stats.reset(token)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(ConditionalGetMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Outermost, so the timings include every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -1997,6 +4375,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    result = await ensure_indexes()
+    logger.info(f"Ensured {len(result['created'])} indexes ({len(result['failed'])} failed)")
+    
+    if await db.conversations.estimated_document_count() == 0:
+        # First start with conversation summaries - backfill without holding up startup
+        app.state.conversation_backfill = asyncio.create_task(backfill_conversations())
+    
+    if not await db.chat_rollups.find_one({"id": CHAT_ROLLUP_TOTALS}):
+        app.state.chat_rollup_backfill = asyncio.create_task(rebuild_chat_rollups())
+    
+    # Also builds the counters on first start
+    app.state.counter_reconciler = asyncio.create_task(reconcile_counters_periodically())
+    task_queue.start()
+    await task_queue.start_watcher()
+    await event_bus.start_relay()
+    if email_sender.transport is None:
+        logger.error("No email transport configured - password reset emails are disabled. Set SMTP_HOST or EMAIL_TRANSPORT=log")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    app.state.counter_reconciler.cancel()
+    event_bus.stop_relay()
+    await task_queue.drain(TASK_DRAIN_SECONDS)
+    email_sender.close()
+    client.close()
+    password_hash_pool.executor.shutdown(wait=False)
+    payment_gateway.close()
\ No newline at end of file
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Check that a user deletion cascade survives being interrupted part way through.
+
+Uses a scratch MongoDB database (MONGO_URL from backend/.env) and a temporary
+upload root, and calls the handlers directly: the deleted buyer's jobs must close
+with the request, and a cascade that fails after the bids and jobs are gone must
+still remove their upload directories on the retry without repeating counter updates,
+and leave unread notification counts matching the notifications that remain.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+
+class CascadeDeleteTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def check(self, name, condition, detail=""):
+        self.tests_run += 1
+        if condition:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name} {detail}")
+        return condition
+
+    def supplier(self, suffix):
+        return server.User(id=f"supplier-{suffix}", email=f"cascade_{suffix}@test.com", company_name="Cascade Supplier",
+                           contact_phone="9999999999", role="supplier", gst_number="27ABCDE1234F1Z5",
+                           address="Cascade Street, Pune, Maharashtra - 411001")
+
+    async def setup(self, db):
+        """A buyer with one open job, a supplier bid on it and upload directories for both"""
+        buyer_id = f"buyer-{uuid.uuid4().hex[:8]}"
+        job_id = str(uuid.uuid4())
+        supplier = self.supplier(uuid.uuid4().hex[:8])
+        await db.users.insert_many([
+            {"id": buyer_id, "email": f"{buyer_id}@test.com", "role": "buyer", "created_at": datetime.utcnow()},
+            {**supplier.dict()}
+        ])
+        await db.jobs.insert_one({
+            "id": job_id, "title": "Cascade test job", "category": "material", "description": "Resume check",
+            "location": "Pune", "delivery_timeline": "1 week", "posted_by": buyer_id, "status": "open",
+            "created_at": datetime.utcnow(), "file_urls": []
+        })
+        bid = await server.submit_bid(job_id, server.BidCreate(price_quote=1000.0, delivery_estimate="2 days"), current_user=supplier)
+        # Two unread and one read about the job, plus one unread about something else that must stay counted
+        await db.notifications.insert_many([
+            {"id": str(uuid.uuid4()), "user_id": supplier.id, "related_job_id": related, "read": read, "created_at": datetime.utcnow()}
+            for related, read in [(job_id, False), (job_id, False), (job_id, True), ("other-job", False)]
+        ])
+        await server.reconcile_counters()
+
+        dirs = [f"{server.UPLOAD_ROOT}/jobs/{job_id}", f"{server.UPLOAD_ROOT}/bids/{bid.id}"]
+        for path in dirs:
+            os.makedirs(path)
+            with open(f"{path}/file.txt", "w") as f:
+                f.write("upload")
+        return buyer_id, job_id, supplier, bid, dirs
+
+    async def test_resume(self, db):
+        print("\n🔍 Interrupted cascade")
+        buyer_id, job_id, supplier, bid, dirs = await self.setup(db)
+        counters = await db.dashboard_counters.find_one({"id": supplier.id})
+        supplier_bids, supplier_unread = counters["total_bids"], counters["unread_notifications"]
+        server.unread_count_cache.set(supplier.id, supplier_unread)
+
+        result = await server.delete_user(buyer_id, current_user=None)
+        deletion_id = result["deletion_id"]
+        job = await db.jobs.find_one({"id": job_id})
+        self.check("Job is closed with the deletion request", job and job["status"] == "closed", f"- {job and job['status']}")
+        deletion = await db.deletions.find_one({"id": deletion_id})
+        self.check("Deletion records the user's jobs", [j["id"] for j in deletion["jobs"]] == [job_id])
+        try:
+            await server.submit_bid(job_id, server.BidCreate(price_quote=900.0, delivery_estimate="1 day"),
+                                    current_user=self.supplier(uuid.uuid4().hex[:8]))
+            self.check("New bids on the deleted user's job are refused", False)
+        except HTTPException as e:
+            self.check("New bids on the deleted user's job are refused", e.status_code == 404, f"- got {e.status_code}")
+
+        # Fail on the step after the bids and jobs are deleted
+        remove_upload_dirs = server.remove_upload_dirs
+
+        async def fail(paths):
+            raise RuntimeError("interrupted")
+
+        server.remove_upload_dirs = fail
+        try:
+            await server.cascade_delete_task(deletion_id)
+            self.check("Interrupted cascade raises", False)
+        except RuntimeError:
+            self.check("Interrupted cascade raises", True)
+        finally:
+            server.remove_upload_dirs = remove_upload_dirs
+
+        deletion = await db.deletions.find_one({"id": deletion_id})
+        self.check("Steps up to jobs are recorded", {"bids", "jobs"} <= set(deletion["steps_done"]), f"- {deletion['steps_done']}")
+        self.check("Deletion is marked for retry", deletion["status"] == "retrying")
+        self.check("Bid list is recorded on the deletion", [b["id"] for b in deletion["bids"] or []] == [bid.id])
+        self.check("Job and bid documents are gone", not await db.jobs.find_one({"id": job_id}) and not await db.bids.find_one({"id": bid.id}))
+
+        await server.cascade_delete_task(deletion_id)
+        deletion = await db.deletions.find_one({"id": deletion_id})
+        self.check("Retried cascade finishes", deletion["status"] == "done", f"- {deletion['status']}")
+        self.check("Upload directories are removed on the retry", not any(os.path.exists(path) for path in dirs),
+                   f"- {[path for path in dirs if os.path.exists(path)]}")
+        self.check("Retry removed both directories", deletion["deleted"].get("upload_dirs") == len(dirs), f"- {deletion['deleted']}")
+        counters = await db.dashboard_counters.find_one({"id": supplier.id})
+        self.check("Supplier bid count dropped once", counters["total_bids"] == supplier_bids - 1,
+                   f"- {supplier_bids} -> {counters['total_bids']}")
+        remaining = await db.notifications.count_documents({"user_id": supplier.id, "read": False})
+        self.check("Supplier unread count matches the notifications left", counters["unread_notifications"] == remaining == 1,
+                   f"- counter {supplier_unread} -> {counters['unread_notifications']}, {remaining} unread left")
+        self.check("Cached unread count is dropped", server.unread_count_cache.get(supplier.id) is None)
+
+    async def run(self):
+        scratch_db = f"{os.environ['DB_NAME']}_cascade_{uuid.uuid4().hex[:8]}"
+        server.db = server.client[scratch_db]
+        upload_root, server.UPLOAD_ROOT = server.UPLOAD_ROOT, tempfile.mkdtemp()
+        try:
+            await self.test_resume(server.db)
+        finally:
+            shutil.rmtree(server.UPLOAD_ROOT, ignore_errors=True)
+            server.UPLOAD_ROOT = upload_root
+            await server.client.drop_database(scratch_db)
+
+        print(f"\n📊 {self.tests_passed}/{self.tests_run} checks passed")
+        return 0 if self.tests_passed == self.tests_run else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(CascadeDeleteTester().run()))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_job_chat latency against chat history size.
+
+Seeds a scratch MongoDB database (MONGO_URL from backend/.env) with one job and
+N messages from two senders, then times the chat endpoint handler directly.
+Compares the batched sender lookup with the previous one-query-per-message loop.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+MESSAGE_COUNTS = [10, 100, 250, 500, 1000]
+ROUNDS = 5
+
+
+async def per_message_enrichment(messages):
+    """The old enrichment loop - one users lookup per message"""
+    enriched = []
+    for message in messages:
+        message_dict = {k: v for k, v in message.items() if k != '_id'}
+        sender = await server.db.users.find_one({"id": message["sender_id"]})
+        enriched.append({
+            **message_dict,
+            "sender_info": {
+                "company_name": sender["company_name"],
+                "role": sender["role"]
+            } if sender else None
+        })
+    return enriched
+
+
+async def seed(db, job_id, buyer, supplier, count):
+    await db.chat_messages.delete_many({"job_id": job_id})
+    start = datetime.utcnow() - timedelta(days=1)
+    await db.chat_messages.insert_many([{
+        "id": str(uuid.uuid4()),
+        "job_id": job_id,
+        "sender_id": buyer["id"] if i % 2 else supplier["id"],
+        "receiver_id": supplier["id"] if i % 2 else buyer["id"],
+        "message": f"Benchmark message {i}",
+        "file_attachments": [],
+        "created_at": start + timedelta(seconds=i),
+        "read": False
+    } for i in range(count)])
+
+
+async def timed(coro_factory):
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def main():
+    bench_db = f"{os.environ['DB_NAME']}_bench_{uuid.uuid4().hex[:8]}"
+    server.db = server.client[bench_db]
+    db = server.db
+
+    buyer = {"id": str(uuid.uuid4()), "email": "bench-buyer@example.com", "company_name": "Bench Buyer",
+             "contact_phone": "9999999999", "role": "buyer", "gst_number": "27ABCDE1234F1Z5",
+             "address": "Benchmark Street, Pune, Maharashtra - 411001", "created_at": datetime.utcnow()}
+    supplier = {**buyer, "id": str(uuid.uuid4()), "email": "bench-supplier@example.com",
+                "company_name": "Bench Supplier", "role": "supplier"}
+    await db.users.insert_many([dict(buyer), dict(supplier)])
+    await db.users.create_index("id")
+    await db.chat_messages.create_index([("job_id", 1), ("created_at", 1)])
+
+    job_id = str(uuid.uuid4())
+    await db.jobs.insert_one({"id": job_id, "title": "Benchmark job", "posted_by": buyer["id"], "status": "awarded"})
+    await db.bids.insert_one({"id": str(uuid.uuid4()), "job_id": job_id, "supplier_id": supplier["id"], "status": "awarded"})
+    current_user = server.User(**buyer)
+
+    print(f"{'messages':>10} {'per-message (ms)':>18} {'batched (ms)':>14} {'speedup':>9} {'full request (ms)':>19}")
+    try:
+        for count in MESSAGE_COUNTS:
+            await seed(db, job_id, buyer, supplier, count)
+            messages = await db.chat_messages.find({"job_id": job_id}).sort("created_at", 1).to_list(1000)
+
+            old_ms = await timed(lambda: per_message_enrichment(messages))
+            new_ms = await timed(lambda: server.enrich_chat_messages(messages))
+            request_ms = await timed(lambda: server.get_job_chat(job_id, current_user))
+            print(f"{count:>10} {old_ms:>18.1f} {new_ms:>14.1f} {old_ms / new_ms:>8.1f}x {request_ms:>19.1f}")
+    finally:
+        await server.client.drop_database(bench_db)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
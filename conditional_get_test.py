@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import requests
+import sys
+import time
+
+
+class ConditionalGetTester:
+    """Checks ETag / 304 behaviour on the polled list endpoints: write, then poll, then conditional poll"""
+
+    def __init__(self, base_url="https://bb-visibilityfix.preview.emergentagent.com"):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.buyer_token = None
+        self.supplier_token = None
+        self.admin_token = None
+        self.supplier_id = None
+        self.job_id = None
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def check(self, name, condition, detail=""):
+        self.tests_run += 1
+        if condition:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name} {detail}")
+        return condition
+
+    def headers(self, token, etag=None):
+        headers = {"Authorization": f"Bearer {token}"}
+        if etag:
+            headers["If-None-Match"] = etag
+        return headers
+
+    def poll(self, endpoint, token, etag=None):
+        return requests.get(f"{self.api_url}/{endpoint}", headers=self.headers(token, etag))
+
+    def register(self, role, suffix):
+        response = requests.post(f"{self.api_url}/auth/register", json={
+            "email": f"etag_{role}_{suffix}@test.com",
+            "password": "TestPass123!",
+            "company_name": f"ETag Test {role.title()}",
+            "contact_phone": "+91-9876543220",
+            "role": role,
+            "gst_number": "27ABCDE1234F1Z5",
+            "address": "789 Conditional Street, Pune, Maharashtra - 411001"
+        })
+        if response.status_code != 200:
+            print(f"❌ Registration failed - Status: {response.status_code} {response.text}")
+            return None
+        return response.json()
+
+    def setup(self):
+        """A buyer, a supplier with the award on a fresh job, and an admin session"""
+        suffix = int(time.time())
+        buyer = self.register("buyer", suffix)
+        supplier = self.register("supplier", suffix)
+        if not buyer or not supplier:
+            return False
+        self.buyer_token = buyer["access_token"]
+        self.supplier_token = supplier["access_token"]
+        self.supplier_id = supplier["user"]["id"]
+
+        job = requests.post(f"{self.api_url}/jobs", headers=self.headers(self.buyer_token), json={
+            "title": "Conditional GET Test Job",
+            "category": "material",
+            "description": "Testing ETags on polled endpoints",
+            "location": "Pune, Maharashtra",
+            "delivery_timeline": "1 week"
+        })
+        if job.status_code != 200:
+            print(f"❌ Job creation failed - Status: {job.status_code} {job.text}")
+            return False
+        self.job_id = job.json()["id"]
+
+        bid = requests.post(f"{self.api_url}/jobs/{self.job_id}/bids", headers=self.headers(self.supplier_token), json={
+            "price_quote": 50000.0,
+            "delivery_estimate": "5 days"
+        })
+        if bid.status_code != 200:
+            print(f"❌ Bid failed - Status: {bid.status_code} {bid.text}")
+            return False
+        award = requests.post(f"{self.api_url}/jobs/{self.job_id}/award/{bid.json()['id']}", headers=self.headers(self.buyer_token))
+        if award.status_code != 200:
+            print(f"❌ Award failed - Status: {award.status_code} {award.text}")
+            return False
+
+        admin = requests.post(f"{self.api_url}/auth/login", json={
+            "email": "mohammadjalaluddin1027@gmail.com",
+            "password": "5968474644j"
+        })
+        if admin.status_code == 200:
+            self.admin_token = admin.json()["access_token"]
+        print(f"✅ Test job {self.job_id} awarded")
+        return True
+
+    def send_message(self, text):
+        return requests.post(f"{self.api_url}/jobs/{self.job_id}/chat", headers=self.headers(self.buyer_token), json={"message": text})
+
+    def test_write_poll_conditional_poll(self, endpoint, token):
+        """Poll, write, poll again (new body and ETag), then a conditional poll on the new ETag gets 304"""
+        print(f"\n🔍 {endpoint}")
+        first = self.poll(endpoint, token)
+        etag = first.headers.get("ETag")
+        self.check("First poll returns 200 with an ETag", first.status_code == 200 and etag, f"- {first.status_code} {etag}")
+        unchanged = self.poll(endpoint, token, etag)
+        self.check("Conditional poll without a write is 304", unchanged.status_code == 304, f"- got {unchanged.status_code}")
+
+        text = f"ETag check {time.time()}"
+        self.check("Write succeeds", self.send_message(text).status_code == 200)
+
+        after_write = self.poll(endpoint, token, etag)
+        new_etag = after_write.headers.get("ETag")
+        self.check("Conditional poll after the write is 200", after_write.status_code == 200, f"- got {after_write.status_code}")
+        self.check("Body after the write includes the new message", text in after_write.text)
+        self.check("ETag changed with the write", new_etag and new_etag != etag, f"- {etag} -> {new_etag}")
+
+        settled = self.poll(endpoint, token, new_etag)
+        self.check("Conditional poll on the new ETag is 304", settled.status_code == 304, f"- got {settled.status_code}")
+        self.check("304 carries the ETag", settled.headers.get("ETag") == new_etag)
+
+    def test_deleted_user_gets_no_304(self):
+        """A token that outlives its user must not be answered from the ETag"""
+        print("\n🔍 Deleted user")
+        if not self.admin_token:
+            print("⚠️  Admin login failed - skipping deleted user check")
+            return
+        etag = self.poll("chats", self.supplier_token).headers.get("ETag")
+        deleted = requests.delete(f"{self.api_url}/admin/users/{self.supplier_id}", headers=self.headers(self.admin_token))
+        self.check("Admin deletes the supplier", deleted.status_code == 200, f"- got {deleted.status_code}")
+        # Other workers may hold the user in their auth cache for up to its TTL
+        deadline = time.time() + 90
+        while True:
+            response = self.poll("chats", self.supplier_token, etag)
+            if response.status_code not in (200, 304) or time.time() > deadline:
+                break
+            time.sleep(5)
+        self.check("Conditional poll with the deleted user's token is rejected", response.status_code == 401, f"- got {response.status_code}")
+
+    def run(self):
+        if not self.setup():
+            return 1
+        self.test_write_poll_conditional_poll("chats", self.buyer_token)
+        self.test_write_poll_conditional_poll(f"jobs/{self.job_id}/chat", self.supplier_token)
+        self.test_deleted_user_gets_no_304()
+
+        print(f"\n📊 {self.tests_passed}/{self.tests_run} checks passed")
+        return 0 if self.tests_passed == self.tests_run else 1
+
+
+def main():
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "https://bb-visibilityfix.preview.emergentagent.com"
+    return ConditionalGetTester(base_url).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
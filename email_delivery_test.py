@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Check password reset email delivery against a local SMTP stand-in (aiosmtpd).
+
+Uses a scratch MongoDB database (MONGO_URL from backend/.env) and calls the
+handlers directly: the reset task payload must not carry the code, the email must,
+a burst of messages must share pooled connections, and delivery failures and a
+missing transport must surface as errors.
+"""
+
+import asyncio
+import os
+import smtplib
+import socket
+import sys
+import uuid
+from datetime import datetime
+
+from aiosmtpd.controller import Controller
+from fastapi import HTTPException
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+BURST_SIZE = 10
+POOL_SIZE = 2
+
+
+class RecordingHandler:
+    """Keeps every message aiosmtpd accepts and counts client sessions"""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = 0
+
+    async def handle_EHLO(self, smtp_server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, smtp_server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.content.decode()))
+        return "250 OK"
+
+
+class DroppingConnection:
+    """Stands in for smtplib.SMTP: delivers `deliver` messages, then reports a dropped connection"""
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.delivered = []
+
+    def send_message(self, message):
+        if len(self.delivered) == self.deliver:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.delivered.append(message["To"])
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class EmailDeliveryTester:
+    def __init__(self):
+        self.tests_run = 0
+        self.tests_passed = 0
+
+    def check(self, name, condition, detail=""):
+        self.tests_run += 1
+        if condition:
+            self.tests_passed += 1
+            print(f"✅ {name}")
+        else:
+            print(f"❌ {name} {detail}")
+        return condition
+
+    def sender(self, port):
+        transport = server.SMTPTransport("127.0.0.1", port, None, None, use_tls=False, pool_size=POOL_SIZE, timeout=5)
+        return server.EmailSender(transport, "noreply@buildbidz.co.in", batch_size=20, batch_window_seconds=0.2, rate_per_second=100)
+
+    async def test_reset_code(self, db, handler):
+        print("\n🔍 Reset code delivery")
+        email = f"reset_{uuid.uuid4().hex[:8]}@test.com"
+        await db.users.insert_one({"id": str(uuid.uuid4()), "email": email, "created_at": datetime.utcnow()})
+        await server.forgot_password(server.PasswordReset(email=email))
+
+        reset = await db.password_resets.find_one({"email": email})
+        task = await db.tasks.find_one({"name": "send_reset_code", "payload.reset_id": reset["id"]}, {"_id": 0})
+        self.check("Reset task is queued", task is not None)
+        self.check("Task payload does not contain the code", task and reset["reset_code"] not in str(task), f"- {task}")
+
+        await server.send_reset_code_task(**task["payload"])
+        delivered = [content for recipients, content in handler.messages if email in recipients]
+        self.check("Reset email reaches the SMTP server", len(delivered) == 1, f"- got {len(delivered)}")
+        self.check("Email carries the stored code", delivered and reset["reset_code"] in delivered[0])
+
+        # A newer request replaces the code - the older queued task must not send a stale one
+        await server.forgot_password(server.PasswordReset(email=email))
+        await server.send_reset_code_task(**task["payload"])
+        delivered = [content for recipients, content in handler.messages if email in recipients]
+        self.check("Superseded reset task sends nothing", len(delivered) == 1, f"- got {len(delivered)}")
+
+    async def test_burst(self, handler):
+        print("\n🔍 Batched burst")
+        before_messages, before_sessions = len(handler.messages), handler.sessions
+        await asyncio.gather(*(
+            server.email_sender.send(f"burst_{i}@test.com", "Burst", f"Message {i}") for i in range(BURST_SIZE)
+        ))
+        self.check(f"All {BURST_SIZE} messages delivered", len(handler.messages) - before_messages == BURST_SIZE)
+        sessions = handler.sessions - before_sessions
+        self.check(f"Burst reused pooled connections ({sessions} new)", sessions <= POOL_SIZE)
+
+    async def test_failures(self, db):
+        print("\n🔍 Failures")
+        dead = self.sender(free_port())
+        try:
+            await dead.send("nobody@test.com", "Unreachable", "No server")
+            self.check("Send to an unreachable server raises", False)
+        except Exception as e:
+            self.check("Send to an unreachable server raises", True)
+            print(f"   {type(e).__name__}: {e}")
+        finally:
+            dead.close()
+
+        # The connection drops after two messages and the reconnect fails: only the rest may fail
+        transport = server.SMTPTransport("127.0.0.1", free_port(), None, None, use_tls=False, pool_size=1, timeout=5)
+        dropping = DroppingConnection(deliver=2)
+        transport._checkout = lambda: dropping
+        messages = [server.MIMEMultipart() for _ in range(4)]
+        for i, message in enumerate(messages):
+            message["To"] = f"partial_{i}@test.com"
+        errors = await transport.send_batch(messages)
+        self.check("Messages sent before the drop report success", errors[:2] == [None, None], f"- {errors}")
+        self.check("Messages after the drop report errors", all(errors[2:]) and len(errors) == 4, f"- {errors}")
+        self.check("No connection is leaked or pooled after a failed reconnect", transport.idle.empty())
+        transport.close()
+
+        transport, server.email_sender.transport = server.email_sender.transport, None
+        try:
+            await server.forgot_password(server.PasswordReset(email="anyone@test.com"))
+            self.check("Forgot-password without a transport fails loudly", False)
+        except HTTPException as e:
+            self.check("Forgot-password without a transport fails loudly", e.status_code == 503, f"- got {e.status_code}")
+        finally:
+            server.email_sender.transport = transport
+
+    async def run(self):
+        handler = RecordingHandler()
+        port = free_port()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+
+        bench_db = f"{os.environ['DB_NAME']}_email_{uuid.uuid4().hex[:8]}"
+        server.db = server.client[bench_db]
+        server.email_sender = self.sender(port)
+        try:
+            await self.test_reset_code(server.db, handler)
+            await self.test_burst(handler)
+            await self.test_failures(server.db)
+        finally:
+            server.email_sender.close()
+            controller.stop()
+            await server.client.drop_database(bench_db)
+
+        print(f"\n📊 {self.tests_passed}/{self.tests_run} checks passed")
+        return 0 if self.tests_passed == self.tests_run else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(EmailDeliveryTester().run()))
@@ -11,6 +11,7 @@ const AdminUserDetailModal = ({ userId, isOpen, onClose }) => {
   const [userDetails, setUserDetails] = useState(null);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('info');
+  const [loadingMore, setLoadingMore] = useState(null);
 
   useEffect(() => {
     if (isOpen && userId) {
@@ -30,6 +31,25 @@ const AdminUserDetailModal = ({ userId, isOpen, onClose }) => {
     }
   };
 
+  // kind is 'jobs' or 'bids' - fetch the next page of that list and append it
+  const loadMore = async (kind) => {
+    setLoadingMore(kind);
+    try {
+      const response = await axios.get(`${API}/admin/users/${userId}/details`, {
+        params: { [`${kind}_cursor`]: userDetails[`next_${kind}_cursor`] }
+      });
+      setUserDetails(prev => ({
+        ...prev,
+        [kind]: [...prev[kind], ...response.data[kind]],
+        [`next_${kind}_cursor`]: response.data[`next_${kind}_cursor`]
+      }));
+    } catch (error) {
+      console.error(`Failed to load more ${kind}:`, error);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   const getCategoryIcon = (category) => {
     switch (category) {
       case 'material': return <Package className="h-4 w-4" />;
@@ -272,6 +292,15 @@ const AdminUserDetailModal = ({ userId, isOpen, onClose }) => {
                       </div>
                     ))
                   )}
+                  {userDetails.next_jobs_cursor && (
+                    <button
+                      onClick={() => loadMore('jobs')}
+                      disabled={loadingMore === 'jobs'}
+                      className="w-full p-3 text-sm text-orange-400 hover:bg-gray-700 rounded-lg disabled:opacity-50"
+                    >
+                      {loadingMore === 'jobs' ? 'Loading...' : 'Load more jobs'}
+                    </button>
+                  )}
                 </div>
               )}
 
@@ -290,6 +319,11 @@ const AdminUserDetailModal = ({ userId, isOpen, onClose }) => {
                           <div>
                             <h4 className="text-lg font-semibold text-white">Bid #{bid.id.substring(0, 8)}</h4>
                             <p className="text-sm text-gray-400">Job ID: {bid.job_id.substring(0, 8)}</p>
+                            {bid.company_details && (
+                              <p className="text-sm text-gray-400">
+                                Company: {bid.company_details.company_name} ({bid.company_details.company_contact_phone})
+                              </p>
+                            )}
                           </div>
                           <span className={`px-3 py-1 rounded-full text-xs font-semibold ${getStatusColor(bid.status)}`}>
                             {bid.status}
@@ -320,6 +354,15 @@ const AdminUserDetailModal = ({ userId, isOpen, onClose }) => {
                       </div>
                     ))
                   )}
+                  {userDetails.next_bids_cursor && (
+                    <button
+                      onClick={() => loadMore('bids')}
+                      disabled={loadingMore === 'bids'}
+                      className="w-full p-3 text-sm text-orange-400 hover:bg-gray-700 rounded-lg disabled:opacity-50"
+                    >
+                      {loadingMore === 'bids' ? 'Loading...' : 'Load more bids'}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
@@ -7,6 +7,9 @@ import {
   Image, Trash2
 } from 'lucide-react';
 import axios from 'axios';
+import { subscribeToEvents } from '../lib/events';
+
+const CHATS_PAGE_SIZE = 50;
 
 const ChatPage = () => {
   const { user, API } = useContext(AuthContext);
@@ -14,6 +17,7 @@ const ChatPage = () => {
   const jobId = searchParams.get('job_id');
   
   const [chats, setChats] = useState([]);
+  const [chatsCursor, setChatsCursor] = useState(null);
   const [selectedChat, setSelectedChat] = useState(null);
   const [messages, setMessages] = useState([]);
   const [newMessage, setNewMessage] = useState('');
@@ -23,6 +27,11 @@ const ChatPage = () => {
   const [showFileUpload, setShowFileUpload] = useState(false);
   const messagesEndRef = useRef(null);
   const fileInputRef = useRef(null);
+  const chatCursorRef = useRef(null);
+  const deletedCursorRef = useRef(null);
+  const selectedChatRef = useRef(null);
+  const fetchMessagesRef = useRef(null);
+  const fetchChatsRef = useRef(null);
 
   useEffect(() => {
     fetchChats();
@@ -30,18 +39,39 @@ const ChatPage = () => {
       selectChatByJobId(jobId);
     }
     
-    // Auto-refresh chat list every 10 seconds
-    const chatListInterval = setInterval(fetchChats, 10000);
+    // Push events drive updates; this slow poll is only a fallback
+    const chatListInterval = setInterval(() => fetchChatsRef.current(), 60000);
     return () => clearInterval(chatListInterval);
   }, [jobId]);
 
+  useEffect(() => {
+    // Shares the tab's one event stream with the notification bell
+    const refreshChat = (data) => {
+      if (selectedChatRef.current && selectedChatRef.current.job_id === data.job_id) {
+        fetchMessagesRef.current();
+      }
+      fetchChatsRef.current();
+    };
+    const unsubscribes = [
+      subscribeToEvents(API, 'chat_message', refreshChat),
+      subscribeToEvents(API, 'chat_message_deleted', refreshChat),
+      subscribeToEvents(API, 'chat_read', () => fetchChatsRef.current()),
+      subscribeToEvents(API, 'job_awarded', () => fetchChatsRef.current())
+    ];
+    return () => unsubscribes.forEach((unsubscribe) => unsubscribe());
+  }, []);
+
   useEffect(() => {
     if (selectedChat) {
+      // Start a fresh sync for the newly selected chat
+      chatCursorRef.current = null;
+      deletedCursorRef.current = null;
+      setMessages([]);
       fetchMessages();
       markChatAsRead();
       
-      // Auto-refresh messages every 2 seconds for real-time feel
-      const interval = setInterval(fetchMessages, 2000);
+      // New messages arrive over the event stream; poll slowly as a fallback
+      const interval = setInterval(fetchMessages, 30000);
       return () => clearInterval(interval);
     }
   }, [selectedChat]);
@@ -50,12 +80,22 @@ const ChatPage = () => {
     scrollToBottom();
   }, [messages]);
 
+  useEffect(() => {
+    // Event handlers are registered once, so they read the latest state through refs
+    selectedChatRef.current = selectedChat;
+    fetchMessagesRef.current = fetchMessages;
+    fetchChatsRef.current = fetchChats;
+  });
+
   const fetchChats = async () => {
     try {
+      // Refresh everything already on screen, not just the first page
       const response = await axios.get(`${API}/chats`, {
-        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+        params: { limit: Math.max(CHATS_PAGE_SIZE, chats.length) }
       });
       setChats(response.data);
+      setChatsCursor(response.headers['x-next-cursor'] || null);
     } catch (error) {
       console.error('Failed to fetch chats:', error);
     } finally {
@@ -63,6 +103,24 @@ const ChatPage = () => {
     }
   };
 
+  const loadMoreChats = async () => {
+    if (!chatsCursor) return;
+    
+    try {
+      const response = await axios.get(`${API}/chats`, {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+        params: { cursor: chatsCursor, limit: CHATS_PAGE_SIZE }
+      });
+      setChats(prev => {
+        const seen = new Set(prev.map(c => c.job_id));
+        return [...prev, ...response.data.filter(c => !seen.has(c.job_id))];
+      });
+      setChatsCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      console.error('Failed to load more chats:', error);
+    }
+  };
+
   const selectChatByJobId = (jobId) => {
     const chat = chats.find(c => c.job_id === jobId);
     if (chat) {
@@ -74,10 +132,27 @@ const ChatPage = () => {
     if (!selectedChat) return;
     
     try {
-      const response = await axios.get(`${API}/jobs/${selectedChat.job_id}/chat`, {
-        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+      // Only fetch messages newer than the last cursor we received, plus any deleted since the last sync
+      const params = {};
+      if (chatCursorRef.current) params.since = chatCursorRef.current;
+      if (deletedCursorRef.current) params.deleted_since = deletedCursorRef.current;
+      const response = await axios.get(`${API}/jobs/${selectedChat.job_id}/chat/sync`, {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+        params
       });
-      setMessages(response.data);
+      const { messages: newMessages, cursor, deleted_ids: deletedIds, deleted_cursor: deletedCursor } = response.data;
+      if (newMessages.length > 0 || deletedIds.length > 0) {
+        setMessages(prev => {
+          const seen = new Set(prev.map(m => m.id));
+          const deleted = new Set(deletedIds);
+          // A late message can arrive after a later-numbered one - keep the list in sequence order
+          return [...prev, ...newMessages.filter(m => !seen.has(m.id))]
+            .filter(m => !deleted.has(m.id))
+            .sort((a, b) => (a.seq || 0) - (b.seq || 0));
+        });
+      }
+      chatCursorRef.current = cursor;
+      deletedCursorRef.current = deletedCursor;
     } catch (error) {
       console.error('Failed to fetch messages:', error);
     }
@@ -189,8 +264,8 @@ const ChatPage = () => {
       await axios.delete(`${API}/messages/${messageId}`, {
         headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
       });
-      // Refresh messages after deletion
-      await fetchMessages();
+      // Drop the deleted message right away rather than waiting for the next sync
+      setMessages(prev => prev.filter(m => m.id !== messageId));
       fetchChats(); // Refresh chat list
     } catch (error) {
       console.error('Failed to delete message:', error);
@@ -344,6 +419,14 @@ const ChatPage = () => {
                 </div>
               ))
             )}
+            {chatsCursor && (
+              <button
+                onClick={loadMoreChats}
+                className="w-full p-3 text-sm text-orange-400 hover:bg-gray-800"
+              >
+                Load more chats
+              </button>
+            )}
           </div>
         </div>
 
@@ -2,6 +2,7 @@ import React, { useState, useEffect, useContext } from 'react';
 import { AuthContext } from '../App';
 import { Bell, CheckCircle, Award, X } from 'lucide-react';
 import axios from 'axios';
+import { subscribeToEvents } from '../lib/events';
 
 const NotificationBell = () => {
   const { API } = useContext(AuthContext);
@@ -14,13 +15,21 @@ const NotificationBell = () => {
     fetchNotifications();
     fetchUnreadCount();
     
-    // Fetch notifications every 30 seconds
+    // New notifications are pushed over the event stream; poll slowly as a fallback
     const interval = setInterval(() => {
       fetchNotifications();
       fetchUnreadCount();
-    }, 30000);
+    }, 120000);
     
-    return () => clearInterval(interval);
+    const unsubscribe = subscribeToEvents(API, 'notification', (notification) => {
+      setNotifications(prev => [notification, ...prev.filter(n => n.id !== notification.id)]);
+      setUnreadCount(prev => prev + 1);
+    });
+    
+    return () => {
+      clearInterval(interval);
+      unsubscribe();
+    };
   }, []);
 
   const fetchNotifications = async () => {
@@ -0,0 +1,77 @@
+import axios from 'axios';
+
+// One event stream per tab, shared by every component that listens for pushed events.
+// The stream is opened with a short-lived token from /events/token, so the login JWT never goes in a URL.
+const RECONNECT_DELAY_MS = 5000;
+
+const handlers = {};  // event type -> Set of callbacks
+let source = null;
+let connecting = false;
+let reconnectTimer = null;
+let api = null;
+
+const dispatch = (e) => {
+  const data = JSON.parse(e.data);
+  (handlers[e.type] || []).forEach((handler) => handler(data));
+};
+
+const hasHandlers = () => Object.values(handlers).some((set) => set.size > 0);
+
+const scheduleReconnect = () => {
+  if (reconnectTimer || !hasHandlers()) return;
+  reconnectTimer = setTimeout(() => {
+    reconnectTimer = null;
+    connect();
+  }, RECONNECT_DELAY_MS);
+};
+
+const connect = async () => {
+  const token = localStorage.getItem('token');
+  if (source || connecting || !token) return;
+  connecting = true;
+  try {
+    const response = await axios.post(`${api}/events/token`, {}, {
+      headers: { Authorization: `Bearer ${token}` }
+    });
+    if (!hasHandlers()) return;
+    source = new EventSource(`${api}/events/stream?token=${encodeURIComponent(response.data.token)}`);
+    Object.keys(handlers).forEach((type) => source.addEventListener(type, dispatch));
+    source.onerror = () => {
+      // The browser retries with the same URL, which fails once the stream token expires - reopen with a new one
+      if (source && source.readyState === EventSource.CLOSED) {
+        source = null;
+        scheduleReconnect();
+      }
+    };
+  } catch (error) {
+    console.error('Failed to open event stream:', error);
+    scheduleReconnect();
+  } finally {
+    connecting = false;
+  }
+};
+
+const disconnect = () => {
+  clearTimeout(reconnectTimer);
+  reconnectTimer = null;
+  if (source) {
+    source.close();
+    source = null;
+  }
+};
+
+// Call `handler` with the data of every `type` event; returns a function that stops listening
+export function subscribeToEvents(API, type, handler) {
+  api = API;
+  if (!handlers[type]) {
+    handlers[type] = new Set();
+    if (source) source.addEventListener(type, dispatch);
+  }
+  handlers[type].add(handler);
+  connect();
+
+  return () => {
+    handlers[type].delete(handler);
+    if (!hasHandlers()) disconnect();
+  };
+}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark /jobs/search latency against the number of open jobs.
+
+Seeds a scratch MongoDB database (MONGO_URL from backend/.env) with N open jobs
+spread over categories and locations, builds the open-job facet counts and the
+search indexes, then times the search handler for unfiltered, filtered and keyword
+queries. "cold" clears the keyword facet cache before every round, as a job write
+or an expired entry leaves it; "warm" reuses the cached counts. Both are checked
+against the target.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+JOB_COUNTS = [10_000, 100_000, 1_000_000]
+ROUNDS = 5
+TARGET_MS = 100
+INSERT_BATCH = 10_000
+
+CATEGORIES = ["material", "labor", "equipment", "transport"]
+LOCATIONS = ["Pune", "Mumbai", "Bengaluru", "Delhi", "Chennai", "Hyderabad", "Kolkata", "Ahmedabad"]
+WORDS = ["cement", "steel", "rods", "bricks", "sand", "gravel", "tiles", "paint", "pipes", "wiring", "excavator", "crane"]
+
+QUERIES = [
+    ("unfiltered", {}),
+    ("category", {"category": "material"}),
+    ("category + location", {"category": "labor", "location": "Pune"}),
+    ("keywords", {"q": "cement steel"}),
+    ("keywords + location", {"q": "excavator", "location": "Mumbai"}),
+]
+
+
+async def seed(db, start, count):
+    now = datetime.utcnow()
+    for batch_start in range(start, start + count, INSERT_BATCH):
+        await db.jobs.insert_many([{
+            "id": str(uuid.uuid4()),
+            "title": f"{WORDS[i % len(WORDS)].title()} supply {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "description": f"Need {WORDS[(i * 7) % len(WORDS)]} and {WORDS[(i * 3) % len(WORDS)]} delivered to site",
+            "location": LOCATIONS[i % len(LOCATIONS)],
+            "delivery_timeline": "2 weeks",
+            "posted_by": "bench-buyer",
+            "status": "open",
+            "created_at": now - timedelta(seconds=i),
+            "file_urls": []
+        } for i in range(batch_start, min(batch_start + INSERT_BATCH, start + count))])
+
+
+async def timed(params, current_user, cold):
+    samples = []
+    for _ in range(ROUNDS):
+        if cold:
+            server.search_facet_cache.entries.clear()
+        started = time.perf_counter()
+        await server.search_jobs(**{"q": None, "category": None, "location": None, "budget_range": None,
+                                    "offset": 0, "limit": 20, **params}, current_user=current_user)
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+async def main():
+    bench_db = f"{os.environ['DB_NAME']}_bench_{uuid.uuid4().hex[:8]}"
+    server.db = server.client[bench_db]
+    db = server.db
+
+    for collection, keys, options in server.INDEX_MANIFEST:
+        if collection in ("jobs", "job_facet_counts"):
+            await db[collection].create_index(keys, **options)
+    current_user = server.User(id="bench-supplier", email="bench-supplier@example.com", company_name="Bench Supplier",
+                               contact_phone="9999999999", role="supplier", gst_number="27ABCDE1234F1Z5",
+                               address="Benchmark Street, Pune, Maharashtra - 411001")
+
+    print(f"{'jobs':>10} {'query':<22} {'cold (ms)':>10} {'warm (ms)':>10}")
+    seeded = 0
+    failures = 0
+    try:
+        for count in JOB_COUNTS:
+            await seed(db, seeded, count - seeded)
+            seeded = count
+            await server.reconcile_job_facets()
+            for name, params in QUERIES:
+                cold_ms = await timed(params, current_user, cold=True)
+                warm_ms = await timed(params, current_user, cold=False)
+                over = [label for label, ms in [("cold", cold_ms), ("warm", warm_ms)] if ms > TARGET_MS]
+                flag = f"  ❌ {' and '.join(over)} over {TARGET_MS} ms" if over else ""
+                print(f"{count:>10} {name:<22} {cold_ms:>10.1f} {warm_ms:>10.1f}{flag}")
+                failures += len(over)
+    finally:
+        await server.client.drop_database(bench_db)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
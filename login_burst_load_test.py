@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+import requests
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LoginBurstLoadTester:
+    """Checks that bursts of logins (bcrypt verification) don't inflate latency on unrelated endpoints"""
+
+    def __init__(self, base_url="https://bb-visibilityfix.preview.emergentagent.com", burst_size=50, probe_seconds=10):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.burst_size = burst_size
+        self.probe_seconds = probe_seconds
+        self.token = None
+        self.credentials = None
+
+    def register_supplier(self):
+        self.credentials = {
+            "email": f"loadtest_{int(time.time())}@test.com",
+            "password": "TestPass123!"
+        }
+        response = requests.post(f"{self.api_url}/auth/register", json={
+            **self.credentials,
+            "company_name": "Load Test Supplier",
+            "contact_phone": "+91-9876543299",
+            "role": "supplier",
+            "gst_number": "29ABCDE1234F1Z5",
+            "address": "456 Load Test Street, Bengaluru, Karnataka - 560001"
+        })
+        if response.status_code != 200:
+            print(f"❌ Registration failed - Status: {response.status_code} {response.text}")
+            return False
+        self.token = response.json()["access_token"]
+        print(f"✅ Registered load test supplier {self.credentials['email']}")
+        return True
+
+    def probe_jobs(self, stop_event):
+        """Hit /api/jobs back to back and record each latency in ms"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        samples = []
+        while not stop_event.is_set():
+            started = time.perf_counter()
+            requests.get(f"{self.api_url}/jobs", headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    def login(self, _):
+        return requests.post(f"{self.api_url}/auth/login", json=self.credentials).status_code
+
+    def run_phase(self, name, with_burst):
+        stop_event = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.burst_size + 1) as pool:
+            probe = pool.submit(self.probe_jobs, stop_event)
+            statuses = []
+            deadline = time.time() + self.probe_seconds
+            while time.time() < deadline:
+                if with_burst:
+                    statuses += list(pool.map(self.login, range(self.burst_size)))
+                else:
+                    time.sleep(0.1)
+            stop_event.set()
+            samples = sorted(probe.result())
+
+        p50 = samples[len(samples) // 2]
+        p99 = samples[min(int(len(samples) * 0.99), len(samples) - 1)]
+        print(f"\n🔍 {name}")
+        print(f"   /api/jobs requests: {len(samples)}  p50: {p50:.1f} ms  p99: {p99:.1f} ms")
+        if with_burst:
+            failed = sum(1 for status in statuses if status != 200)
+            print(f"   Logins: {len(statuses)}  failed: {failed}")
+        return p99
+
+    def run(self):
+        if not self.register_supplier():
+            return 1
+        baseline_p99 = self.run_phase("Baseline - no login traffic", with_burst=False)
+        burst_p99 = self.run_phase(f"Login bursts of {self.burst_size}", with_burst=True)
+
+        ratio = burst_p99 / baseline_p99 if baseline_p99 else float("inf")
+        print(f"\n📊 p99 under login bursts is {ratio:.1f}x baseline")
+        if ratio > 3:
+            print("❌ Login bursts are inflating latency on unrelated endpoints")
+            return 1
+        print("✅ Unrelated endpoint latency holds up under login bursts")
+        return 0
+
+
+def main():
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "https://bb-visibilityfix.preview.emergentagent.com"
+    return LoginBurstLoadTester(base_url).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
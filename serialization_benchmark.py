@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization for the list endpoints.
+
+Builds documents shaped like each endpoint's Mongo results and times turning them
+into a response body two ways: the previous path (Pydantic models, jsonable_encoder
+and the stdlib JSONResponse) and fast_json (orjson straight from the documents).
+No database is needed.
+"""
+
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import server  # noqa: E402
+
+ROW_COUNTS = [100, 1000]
+ROUNDS = 20
+
+
+def job_doc(i):
+    return {"id": str(uuid.uuid4()), "title": f"Cement supply {i}", "category": "material",
+            "description": "OPC 53 grade cement, 500 bags, delivered to site in two lots. " * 3,
+            "quantity": "500 bags", "location": "Pune", "delivery_timeline": "2 weeks", "budget_range": "₹2-3 lakh",
+            "posted_by": str(uuid.uuid4()), "status": "open", "created_at": datetime.utcnow() - timedelta(minutes=i),
+            "file_urls": []}
+
+
+def notification_doc(i):
+    return {"id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()), "title": "New Message",
+            "message": f"You have a new message regarding 'Cement supply {i}'", "type": "chat_message",
+            "related_job_id": str(uuid.uuid4()), "related_bid_id": None, "read": False,
+            "created_at": datetime.utcnow() - timedelta(minutes=i)}
+
+
+def enriched_bid_doc(i):
+    return {"id": str(uuid.uuid4()), "job_id": str(uuid.uuid4()), "supplier_id": str(uuid.uuid4()),
+            "price_quote": 250000.0 + i, "delivery_estimate": "10 days", "notes": "Includes unloading",
+            "status": "submitted", "created_at": datetime.utcnow() - timedelta(minutes=i),
+            "supplier_info": {"company_name": "Bench Supplier", "email": "bench@example.com", "contact_phone": "9999999999"},
+            "job_info": {"title": f"Cement supply {i}", "category": "material", "location": "Pune"}}
+
+
+# (endpoint, document factory, how the endpoint built its response before)
+ENDPOINTS = [
+    ("GET /api/jobs", job_doc, lambda docs: [server.JobPost(**doc) for doc in docs]),
+    ("GET /api/notifications", notification_doc, lambda docs: [server.Notification(**doc) for doc in docs]),
+    ("GET /api/admin/bids", enriched_bid_doc, lambda docs: docs),
+]
+
+
+def timed(render):
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        render()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main():
+    print(f"{'endpoint':<24} {'rows':>6} {'default (ms)':>13} {'orjson (ms)':>12} {'speedup':>9}")
+    for endpoint, factory, build in ENDPOINTS:
+        for count in ROW_COUNTS:
+            docs = [factory(i) for i in range(count)]
+            old_ms = timed(lambda: JSONResponse(jsonable_encoder(build(docs))))
+            new_ms = timed(lambda: server.fast_json(docs))
+            print(f"{endpoint:<24} {count:>6} {old_ms:>13.2f} {new_ms:>12.2f} {old_ms / new_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()